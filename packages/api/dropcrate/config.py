@@ -19,6 +19,12 @@ DATABASE_PATH = Path(_env("DROPCRATE_DATABASE_PATH", "./data/dropcrate.db"))
 # Server
 PORT = int(_env("PORT", "8000"))
 
+# Pipeline: number of queue items processed concurrently
+MAX_CONCURRENT = max(1, int(_env("DROPCRATE_MAX_CONCURRENT") or 3))
+
+# ffmpeg: max ffmpeg processes running at once across all pipeline items
+FFMPEG_CONCURRENCY = max(1, int(_env("DROPCRATE_FFMPEG_CONCURRENCY") or os.cpu_count() or 4))
+
 # OpenAI (optional)
 OPENAI_API_KEY = _env("OPENAI_API_KEY")
 OPENAI_MODEL = _env("DROPCRATE_OPENAI_MODEL", "gpt-4o-mini")
@@ -31,6 +37,10 @@ FPCALC_PATH = _env("DROPCRATE_FPCALC_PATH", "fpcalc")
 COOKIES_FROM_BROWSER = _env("DROPCRATE_COOKIES_FROM_BROWSER")
 COOKIES_FILE = _env("DROPCRATE_COOKIES_FILE")
 
+# yt-dlp on-disk cache (player JS, signature/nsig functions) shared by every
+# yt-dlp process; empty means yt-dlp's default (~/.cache/yt-dlp)
+YTDLP_CACHE_DIR = _env("DROPCRATE_YTDLP_CACHE_DIR")
+
 # Uploaded cookies file (auto-detected in data dir)
 UPLOADED_COOKIES_PATH = DATABASE_PATH.parent / "youtube_cookies.txt"
 
@@ -43,6 +53,11 @@ def get_cookies_file() -> str:
     return ""
 
 
+def get_ytdlp_cache_args() -> list[str]:
+    """Return the yt-dlp CLI args that point it at the shared cache dir, if set."""
+    return ["--cache-dir", YTDLP_CACHE_DIR] if YTDLP_CACHE_DIR else []
+
+
 def get_ytdlp_auth_opts() -> dict:
     """Return yt-dlp auth options.
 
@@ -50,6 +50,12 @@ CREATE INDEX IF NOT EXISTS idx_library_downloaded_at ON library_tracks(downloade
 CREATE INDEX IF NOT EXISTS idx_library_artist ON library_tracks(artist);
 CREATE INDEX IF NOT EXISTS idx_library_title ON library_tracks(title);
 CREATE INDEX IF NOT EXISTS idx_library_genre ON library_tracks(genre);
+
+CREATE TABLE IF NOT EXISTS url_metadata (
+    url_hash TEXT PRIMARY KEY,
+    json BLOB NOT NULL,
+    ts INTEGER NOT NULL
+);
 """
 
 # Migrations for existing databases (ALTER TABLE is a no-op in schema but needed for live DBs)
@@ -64,6 +70,11 @@ async def get_db() -> aiosqlite.Connection:
         config.DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
         _db = await aiosqlite.connect(str(config.DATABASE_PATH))
         _db.row_factory = aiosqlite.Row
+        # WAL + synchronous=NORMAL: a commit (e.g. every settings PUT) appends to
+        # the log without an fsync; a crash can't corrupt the db, only power loss
+        # can drop the last few commits
+        await _db.execute("PRAGMA journal_mode=WAL")
+        await _db.execute("PRAGMA synchronous=NORMAL")
         await _db.executescript(SCHEMA)
         # Run migrations for existing databases
         for migration in _MIGRATIONS:
@@ -0,0 +1,39 @@
+"""Lightweight records used inside the pipeline.
+
+Request bodies are validated once by FastAPI (``schemas.py``); each queue item
+is then converted to a frozen slotted dataclass so per-item work does not pay
+for Pydantic model overhead.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dropcrate.models.schemas import DJTags, QueueItemInput
+
+
+@dataclass(frozen=True, slots=True)
+class PresetTags:
+    genre: str = "Other"
+    energy: str = ""
+    time: str = ""
+    vibe: str = ""
+
+    @classmethod
+    def from_model(cls, tags: DJTags) -> PresetTags:
+        return cls(genre=tags.genre, energy=tags.energy, time=tags.time, vibe=tags.vibe)
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineItem:
+    id: str
+    url: str
+    preset_snapshot: PresetTags = PresetTags()
+
+    @classmethod
+    def from_input(cls, item: QueueItemInput) -> PipelineItem:
+        return cls(
+            id=item.id,
+            url=item.url,
+            preset_snapshot=PresetTags.from_model(item.preset_snapshot),
+        )
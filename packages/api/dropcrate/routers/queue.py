@@ -1,14 +1,37 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any, Callable, Coroutine
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Request, Response
+from fastapi.routing import APIRoute
 
 from dropcrate.models.schemas import QueueStartRequest, QueueStartResponse, QueueStopRequest
 from dropcrate.services.job_manager import job_manager
 from dropcrate.services.pipeline import run_pipeline
 
-router = APIRouter()
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded with orjson instead of stdlib json."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+router = APIRouter(route_class=ORJSONRoute)
 
 
 @router.post("/api/queue/start")
@@ -196,21 +196,26 @@ async def segment_events(job_id: str = Query(...)):
     if not job:
         return Response(status_code=404, content="Job not found")
 
-    client_id, queue = segment_job_manager.subscribe(job)
-
     async def event_stream():
-        try:
-            yield "\n"
-            while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"data: {json.dumps(event)}\n\n"
-                    if event.get("type") in ("auto-done", "auto-error"):
-                        break
-                except asyncio.TimeoutError:
-                    yield ": keepalive\n\n"
-        finally:
-            segment_job_manager.unsubscribe(job, client_id)
+        cursor = 0
+        yield "\n"
+        while True:
+            try:
+                events, cursor = await segment_job_manager.wait_for_events(
+                    job, cursor, timeout=30.0
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # Coalesce everything that arrived since the last wake-up into one chunk
+            chunk = []
+            for event in events:
+                chunk.append(f"data: {json.dumps(event)}\n\n")
+                if event.get("type") in ("auto-done", "auto-error"):
+                    break
+            yield "".join(chunk)
+            if event.get("type") in ("auto-done", "auto-error"):
+                break
 
     return StreamingResponse(
         event_stream(),
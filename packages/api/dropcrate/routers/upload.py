@@ -21,7 +21,7 @@ from fastapi import APIRouter, UploadFile, BackgroundTasks
 from dropcrate.services import fingerprint, harmonic, normalize, tagger, transcode
 from dropcrate.services.job_manager import Job, job_manager
 from dropcrate.services.naming import make_rekordbox_filename, sanitize_file_component
-from dropcrate.services.pipeline import _pending_uploads
+from dropcrate.services.pipeline import _fast_move, _pending_uploads
 from dropcrate.database import get_db
 
 logger = logging.getLogger(__name__)
@@ -185,8 +185,7 @@ async def _resume_pipeline_inner(ctx: dict, uploaded_path: Path) -> None:
 
         # Determine output format and extension
         audio_format = req.audio_format.value
-        ext_map = {"aiff": ".aiff", "wav": ".wav", "flac": ".flac", "mp3": ".mp3"}
-        final_ext = ext_map.get(audio_format, ".aiff")
+        final_ext = normalize._ext_for_format(audio_format)
 
         final_filename = make_rekordbox_filename(
             artist=tags.get("artist", "Unknown"),
@@ -209,15 +208,15 @@ async def _resume_pipeline_inner(ctx: dict, uploaded_path: Path) -> None:
                 target_tp=req.loudness.target_tp,
                 target_lra=req.loudness.target_lra,
             )
-            shutil.move(str(tmp_path), str(final_path))
+            _fast_move(tmp_path, final_path)
         else:
             progress("transcode")
             if downloaded_ext == final_ext:
-                shutil.move(str(downloaded_path), str(final_path))
+                _fast_move(downloaded_path, final_path)
             else:
                 tmp_path = work_dir / f"output{final_ext}"
                 await transcode.transcode(downloaded_path, tmp_path, audio_format)
-                shutil.move(str(tmp_path), str(final_path))
+                _fast_move(tmp_path, final_path)
 
         # Stage 6: Tag
         progress("tag")
@@ -12,22 +12,25 @@ import logging
 import subprocess
 from pathlib import Path
 
+import orjson
+
 from dropcrate import config
 
 logger = logging.getLogger(__name__)
 
 
-def _sync_download(url: str, work_dir: Path) -> Path:
-    """Download audio using yt-dlp CLI subprocess."""
-    work_dir.mkdir(parents=True, exist_ok=True)
-    outtmpl = str(work_dir / "%(title)s.%(ext)s")
+def _decode(output: bytes | None) -> str:
+    return output.decode("utf-8", errors="replace").strip() if output else ""
 
-    # Build base command
-    cmd = [
+
+def _primary_cmd(output: str) -> list[str]:
+    """Build the first-attempt yt-dlp command (without the URL)."""
+    return [
         "yt-dlp",
+        *config.get_ytdlp_cache_args(),
         "--format", "bestaudio[protocol^=http][ext=m4a]/bestaudio[protocol^=http]/18/best",
         "--format-sort", "abr,acodec:aac:opus:mp3",
-        "--output", outtmpl,
+        "--output", output,
         "--no-playlist",
         "--socket-timeout", "30",
         "--retries", "3",
@@ -36,6 +39,15 @@ def _sync_download(url: str, work_dir: Path) -> Path:
         "--remote-components", "ejs:github",
     ]
 
+
+def _sync_download(url: str, work_dir: Path) -> Path:
+    """Download audio using yt-dlp CLI subprocess."""
+    work_dir.mkdir(parents=True, exist_ok=True)
+    outtmpl = str(work_dir / "%(title)s.%(ext)s")
+
+    # Build base command
+    cmd = _primary_cmd(outtmpl)
+
     # Add cookies if available
     cookies_file = config.get_cookies_file()
     if cookies_file:
@@ -48,8 +60,8 @@ def _sync_download(url: str, work_dir: Path) -> Path:
 
     result = subprocess.run(
         cmd,
-        capture_output=True,
-        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         timeout=1800,
     )
 
@@ -61,13 +73,14 @@ def _sync_download(url: str, work_dir: Path) -> Path:
             return downloaded
         raise RuntimeError("yt-dlp succeeded but no output file found")
 
-    stderr = result.stderr.strip() if result.stderr else "no stderr"
+    stderr = _decode(result.stderr) or "no stderr"
     logger.warning(f"[yt-dlp download] Failed (exit {result.returncode}): {stderr[-1500:]}")
 
     # Retry with relaxed format
     logger.info("[yt-dlp download] Retrying with progressive formatting override and Tor routing...")
     cmd_retry = [
         "yt-dlp",
+        *config.get_ytdlp_cache_args(),
         # Strictly ignore m3u8 and dashy chunk formats. Fallbacks directly to format 18 MP4 stream if necessary.
         "-f", "bestaudio[protocol^=http]/18/best",
         "--extract-audio", "--audio-format", "m4a",
@@ -85,8 +98,8 @@ def _sync_download(url: str, work_dir: Path) -> Path:
 
     result2 = subprocess.run(
         cmd_retry,
-        capture_output=True,
-        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         timeout=1800,
     )
 
@@ -96,7 +109,7 @@ def _sync_download(url: str, work_dir: Path) -> Path:
             logger.info(f"[yt-dlp download] Retry success: {downloaded.name}")
             return downloaded
 
-    stderr2 = result2.stderr.strip() if result2.stderr else "no stderr"
+    stderr2 = _decode(result2.stderr) or "no stderr"
     logger.warning(f"yt-dlp download failed after retry: {stderr2[-1500:]}")
     raise RuntimeError(f"yt-dlp download completely failed: {stderr2[-1500:]}")
 
@@ -119,3 +132,70 @@ async def download_audio(url: str, work_dir: Path) -> Path:
         loop.run_in_executor(None, _sync_download, url, work_dir),
         timeout=2000,
     )
+
+
+def _sync_download_with_info(url: str, work_dir: Path) -> tuple[Path, dict]:
+    """Download audio and read yt-dlp's ``.info.json`` from the same extraction."""
+    work_dir.mkdir(parents=True, exist_ok=True)
+    cmd = _primary_cmd(str(work_dir / "%(title)s.%(ext)s"))
+    cmd.append("--write-info-json")
+    cookies_file = config.get_cookies_file()
+    if cookies_file:
+        cmd.extend(["--cookies", cookies_file])
+    cmd.append(url)
+
+    logger.info(f"[yt-dlp download] Downloading with info: {url}")
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=1800,
+    )
+    if result.returncode != 0:
+        stderr = _decode(result.stderr) or "no stderr"
+        raise RuntimeError(f"yt-dlp download failed (exit {result.returncode}): {stderr[-1500:]}")
+
+    downloaded = _find_most_recent(work_dir)
+    info_files = list(work_dir.glob("*.info.json"))
+    if not downloaded or not info_files:
+        raise RuntimeError("yt-dlp succeeded but no output file found")
+    info_path = max(info_files, key=lambda f: f.stat().st_mtime)
+    info = orjson.loads(info_path.read_bytes())
+    info_path.unlink()
+    return downloaded, info
+
+
+async def download_audio_with_info(url: str, work_dir: Path) -> tuple[Path, dict]:
+    """Download audio and return it with its video info from one yt-dlp run.
+
+    Saves the separate ``fetch_video_info`` extraction when the caller does not
+    need the info before the download starts. Unlike ``download_audio`` there
+    is no relaxed-format retry.
+    """
+    loop = asyncio.get_event_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(None, _sync_download_with_info, url, work_dir),
+        timeout=2000,
+    )
+
+
+async def download_audio_stream(url: str, stdout: int) -> asyncio.subprocess.Process:
+    """Start yt-dlp writing the best audio stream to the ``stdout`` file descriptor.
+
+    Used to pipe audio straight into ffmpeg without an intermediate file. There
+    is no relaxed-format retry here; use ``download_audio`` when that matters.
+    """
+    cmd = _primary_cmd("-")
+    cmd.extend(["--quiet", "--no-progress"])
+    cookies_file = config.get_cookies_file()
+    if cookies_file:
+        cmd.extend(["--cookies", cookies_file])
+    cmd.append(url)
+
+    logger.info(f"[yt-dlp download] Streaming: {url}")
+    return await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=stdout,
+        stderr=asyncio.subprocess.PIPE,
+    )
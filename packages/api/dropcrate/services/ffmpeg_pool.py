@@ -0,0 +1,105 @@
+"""Shared ffmpeg runner with a bounded process pool.
+
+A running ffmpeg cannot be handed a new job (each invocation has its own
+inputs, filter graph and output), so rather than keeping processes alive the
+pool caps how many ffmpeg (and ffprobe) processes run at once across
+normalize, transcode and tagging. That keeps concurrent pipeline items from
+oversubscribing the CPU with decode/encode work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import weakref
+from collections import deque
+
+from dropcrate import config
+
+# ffmpeg stderr lines kept for error messages and loudnorm JSON
+STDERR_TAIL_LINES = 200
+# stderr is read in chunks rather than with readline(): progress records end
+# in "\r", and readline() raises once 64 KiB arrive without a "\n"
+_READ_CHUNK = 64 * 1024
+_LINE_END_RE = re.compile(rb"[\r\n]")
+# Every ffmpeg run: no banner, no progress stats on stderr
+_QUIET_ARGS = ("-hide_banner", "-nostats")
+
+# One semaphore per event loop: a semaphore binds to the loop that first waits
+# on it, and tests (or a restarted server) run on more than one loop
+_sems: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_sem() -> asyncio.Semaphore:
+    """Return the process cap for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    sem = _sems.get(loop)
+    if sem is None:
+        sem = _sems[loop] = asyncio.Semaphore(config.FFMPEG_CONCURRENCY)
+    return sem
+
+
+async def run(args: list[str], stdin: int = asyncio.subprocess.DEVNULL) -> tuple[int, str]:
+    """Run ffmpeg with ``args`` and return (return_code, stderr tail).
+
+    stderr is split into lines as it arrives and only the last ``STDERR_TAIL_LINES`` lines
+    are kept, so memory stays flat on long runs. Does not raise on a non-zero
+    exit; callers format their own error. ``stdin`` may be a file descriptor
+    for ``-i pipe:0`` inputs.
+    """
+    async with _get_sem():
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            *_QUIET_ARGS,
+            *args,
+            stdin=stdin,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr = await read_stderr_tail(proc)
+    return proc.returncode or 0, stderr
+
+
+async def probe(args: list[str]) -> tuple[int, str]:
+    """Run ffprobe with ``args`` under the same cap and return (return_code, stdout).
+
+    Raises ``OSError`` if ffprobe cannot be started.
+    """
+    async with _get_sem():
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await proc.communicate()
+    return proc.returncode or 0, stdout.decode("utf-8", errors="replace")
+
+
+async def read_stderr_tail(proc: asyncio.subprocess.Process) -> str:
+    """Drain ``proc.stderr``, wait for exit, and return the last lines.
+
+    Lines may end in ``\n`` or ``\r``. Keeps at most ``STDERR_TAIL_LINES``
+    lines (and one partial line of up to ``_READ_CHUNK`` bytes) in memory
+    however much the process writes. If reading fails or is cancelled the
+    process is killed, so it never stays blocked on a full pipe.
+    """
+    tail: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+    partial = b""
+    try:
+        while chunk := await proc.stderr.read(_READ_CHUNK):
+            *lines, partial = _LINE_END_RE.split(partial + chunk)
+            tail.extend(line for line in lines if line)
+            partial = partial[-_READ_CHUNK:]
+        if partial:
+            tail.append(partial)
+        await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return "".join(line.decode("utf-8", errors="replace") + "\n" for line in tail)
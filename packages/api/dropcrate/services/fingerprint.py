@@ -8,6 +8,7 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+import re
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -17,6 +18,8 @@ from dropcrate import config
 
 _ACOUSTID_CACHE: dict[str, dict] = {}
 _CACHE_MAX = 500
+# "Title (Version)" as MusicBrainz writes it; same 2-80 char bound as title_parser
+_MB_VERSION_RE = re.compile(r"^(.+?)\s*\(([^)]{2,80})\)\s*$")
 
 
 @dataclass
@@ -213,9 +216,7 @@ def _pick_best_release(releases: list | None) -> tuple[str | None, str | None, s
 
 def _apply_fallback_version(title: str, fallback_version: str | None) -> tuple[str, str | None]:
     """Extract version from MusicBrainz title, or apply fallback from YouTube."""
-    import re
-
-    match = re.match(r"^(.+?)\s*\(([^)]{2,80})\)\s*$", title)
+    match = _MB_VERSION_RE.match(title)
     if match:
         return title, match.group(2).strip()
 
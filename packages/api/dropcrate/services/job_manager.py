@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 
+HISTORY_LIMIT = 500
+
 
 @dataclass
 class Job:
     id: str
     cancel_requested: bool = False
     completed_ids: list[str] = field(default_factory=list)
-    history: list[dict] = field(default_factory=list)
-    subscribers: dict[str, asyncio.Queue] = field(default_factory=dict)
+    # Ring buffer of recent events; SSE readers keep a cursor into it
+    history: deque[dict] = field(default_factory=lambda: deque(maxlen=HISTORY_LIMIT))
+    # Total events ever broadcast (cursor upper bound)
+    seq: int = 0
+    event_ready: asyncio.Event = field(default_factory=asyncio.Event)
+    pending_tasks: list[asyncio.Task] = field(default_factory=list)
+    pending_rows: list[tuple] = field(default_factory=list)
+    # Held while queued rows are inserted, so a flush that finds the queue empty
+    # still waits for an in-progress insert that took its row
+    rows_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
 class JobManager:
@@ -29,28 +41,32 @@ class JobManager:
 
     def broadcast(self, job: Job, event: dict) -> None:
         job.history.append(event)
-        if len(job.history) > 500:
-            job.history = job.history[-500:]
-        for q in job.subscribers.values():
-            try:
-                q.put_nowait(event)
-            except asyncio.QueueFull:
-                pass
-
-    def subscribe(self, job: Job) -> tuple[str, asyncio.Queue]:
-        client_id = str(uuid.uuid4())[:8]
-        q: asyncio.Queue = asyncio.Queue(maxsize=200)
-        job.subscribers[client_id] = q
-        # Replay history
-        for evt in job.history:
-            try:
-                q.put_nowait(evt)
-            except asyncio.QueueFull:
-                break
-        return client_id, q
-
-    def unsubscribe(self, job: Job, client_id: str) -> None:
-        job.subscribers.pop(client_id, None)
+        job.seq += 1
+        job.event_ready.set()
+
+    def events_since(self, job: Job, cursor: int) -> tuple[list[dict], int]:
+        """Return events broadcast after ``cursor`` and the new cursor.
+
+        A cursor of 0 replays the retained history. Readers that fall more
+        than ``HISTORY_LIMIT`` events behind skip the overwritten ones.
+        """
+        missed = job.seq - cursor
+        if missed <= 0:
+            return [], cursor
+        start = max(0, len(job.history) - missed)
+        return list(itertools.islice(job.history, start, None)), job.seq
+
+    async def wait_for_events(
+        self, job: Job, cursor: int, timeout: float
+    ) -> tuple[list[dict], int]:
+        """Wait until events newer than ``cursor`` exist and return them all.
+
+        Raises ``asyncio.TimeoutError`` if nothing arrives within ``timeout``.
+        """
+        while job.seq == cursor:
+            job.event_ready.clear()
+            await asyncio.wait_for(job.event_ready.wait(), timeout)
+        return self.events_since(job, cursor)
 
     def cancel_job(self, job_id: str) -> bool:
         job = self._jobs.get(job_id)
@@ -7,17 +7,34 @@ Uses subprocess instead of yt-dlp Python API to ensure plugins
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import subprocess
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# In-memory metadata cache: canonical URL -> (fetched_at, info)
+_INFO_CACHE_TTL = 3600
+_INFO_CACHE_MAX = 512
+_TRACKING_PARAMS = {"si", "feature", "pp", "t", "fbclid", "gclid"}
+_info_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def _decode(output: bytes | None) -> str:
+    return output.decode("utf-8", errors="replace").strip() if output else ""
+
 
 def _sync_fetch_info(url: str) -> dict:
     """Fetch metadata using yt-dlp CLI subprocess (plugins load correctly)."""
+    from dropcrate import config
+
     cmd = [
         "yt-dlp",
+        *config.get_ytdlp_cache_args(),
         "--dump-json",
         "--no-download",
         "--no-playlist",
@@ -28,7 +45,6 @@ def _sync_fetch_info(url: str) -> dict:
         "--remote-components", "ejs:github",
     ]
 
-    from dropcrate import config
     cookies_file = config.get_cookies_file()
     if cookies_file:
         cmd.extend(["--cookies", cookies_file])
@@ -38,20 +54,20 @@ def _sync_fetch_info(url: str) -> dict:
     logger.info(f"[yt-dlp metadata] Running: {' '.join(cmd[:6])}... {url}")
 
     try:
+        # stdout stays bytes: the --dump-json line is large and orjson parses bytes directly
         result = subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
             timeout=90,
         )
 
         if result.returncode == 0 and result.stdout.strip():
-            info = json.loads(result.stdout.strip().split("\n")[0])
+            info = orjson.loads(result.stdout.strip().split(b"\n", 1)[0])
             logger.info(f"[yt-dlp metadata] Success: {info.get('title', 'unknown')}")
             return info
 
         # Log the latest error for debugging
-        stderr = result.stderr.strip() if result.stderr else "no stderr"
+        stderr = _decode(result.stderr) or "no stderr"
         # Log last 1000 chars where the actual error is usually situated
         logger.warning(f"[yt-dlp metadata] Failed (exit {result.returncode}): ... {stderr[-1000:]}")
 
@@ -61,29 +77,55 @@ def _sync_fetch_info(url: str) -> dict:
         result_v = subprocess.run(
             cmd_v,
             capture_output=True,
-            text=True,
             timeout=90,
         )
 
         if result_v.returncode == 0 and result_v.stdout.strip():
-            info = json.loads(result_v.stdout.strip().split("\n")[0])
+            info = orjson.loads(result_v.stdout.strip().split(b"\n", 1)[0])
             logger.info(f"[yt-dlp metadata] Verbose retry succeeded: {info.get('title', 'unknown')}")
             return info
 
-        stderr_v = result_v.stderr.strip() if result_v.stderr else "no stderr"
+        stderr_v = _decode(result_v.stderr) or "no stderr"
         logger.error(f"[yt-dlp metadata] FULL VERBOSE ERROR: {stderr_v}")
         raise RuntimeError(f"yt-dlp metadata extraction failed: ... {stderr_v[-1500:]}")
 
     except subprocess.TimeoutExpired:
         raise RuntimeError(f"yt-dlp metadata extraction timed out for {url}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise RuntimeError(f"yt-dlp returned invalid JSON: {e}")
 
 
+def canonical_url(url: str) -> str:
+    """Canonicalize a URL for caching by dropping tracking query params."""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in _TRACKING_PARAMS and not k.startswith("utm_")
+    ]
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(sorted(query)), ""
+    ))
+
+
 async def fetch_video_info(url: str) -> dict:
-    """Fetch video metadata from YouTube without downloading."""
+    """Fetch video metadata from YouTube without downloading.
+
+    Results are cached in memory per canonical URL for ``_INFO_CACHE_TTL``
+    seconds, so duplicate or retried queue items skip the yt-dlp round-trip.
+    """
+    key = canonical_url(url)
+    hit = _info_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _INFO_CACHE_TTL:
+        _info_cache.move_to_end(key)
+        return dict(hit[1])
+
     loop = asyncio.get_event_loop()
-    return await asyncio.wait_for(
+    info = await asyncio.wait_for(
         loop.run_in_executor(None, _sync_fetch_info, url),
         timeout=120,
     )
+    _info_cache[key] = (time.monotonic(), info)
+    _info_cache.move_to_end(key)
+    while len(_info_cache) > _INFO_CACHE_MAX:
+        _info_cache.popitem(last=False)
+    return dict(info)
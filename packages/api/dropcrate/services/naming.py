@@ -4,11 +4,15 @@ from __future__ import annotations
 
 import re
 
+# Characters filesystems/Rekordbox reject, each mapped to a space in one C-level pass
+_FORBIDDEN_TO_SPACE = str.maketrans(dict.fromkeys('\\/:*?"<>|', " "))
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def sanitize_file_component(value: str) -> str:
-    cleaned = re.sub(r'[\\/:*?"<>|]', " ", value)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-    cleaned = re.sub(r"[. ]+$", "", cleaned)
+    cleaned = value.translate(_FORBIDDEN_TO_SPACE)
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip()
+    cleaned = cleaned.rstrip(". ")
     return cleaned if cleaned else "Untitled"
 
 
@@ -2,45 +2,95 @@
 
 from __future__ import annotations
 
-import asyncio
 import json
-import re
 from pathlib import Path
 
+from dropcrate.services import ffmpeg_pool
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Field names match the loudnorm pass-1 JSON keys so the analysis dict maps straight in
+_PASS2_FILTER = (
+    "loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}"
+    ":measured_I={input_i}:measured_TP={input_tp}:measured_LRA={input_lra}"
+    ":measured_thresh={input_thresh}:offset={target_offset}:linear=true:print_format=summary"
+)
+
+_CODECS = {"aiff": "pcm_s16be", "wav": "pcm_s16le", "flac": "flac", "mp3": "libmp3lame"}
+_EXTENSIONS = {"aiff": ".aiff", "wav": ".wav", "flac": ".flac", "mp3": ".mp3"}
+
 
 def _codec_for_format(fmt: str) -> str:
-    return {"aiff": "pcm_s16be", "wav": "pcm_s16le", "flac": "flac", "mp3": "libmp3lame"}.get(
-        fmt, "pcm_s16be"
-    )
+    return _CODECS.get(fmt, "pcm_s16be")
 
 
 def _ext_for_format(fmt: str) -> str:
-    return {"aiff": ".aiff", "wav": ".wav", "flac": ".flac", "mp3": ".mp3"}.get(fmt, ".aiff")
+    return _EXTENSIONS.get(fmt, ".aiff")
 
 
 async def _run_ffmpeg(args: list[str]) -> tuple[int, str]:
-    """Run ffmpeg and return (return_code, stderr)."""
-    proc = await asyncio.create_subprocess_exec(
-        "ffmpeg",
-        *args,
-        stdin=asyncio.subprocess.DEVNULL,
-        stdout=asyncio.subprocess.DEVNULL,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    _, stderr_bytes = await proc.communicate()
-    stderr = stderr_bytes.decode("utf-8", errors="replace")
-    if proc.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed ({proc.returncode}): {stderr[-4000:]}")
-    return proc.returncode or 0, stderr
-
-
-def _extract_last_json(text: str) -> dict:
-    """Extract the last JSON object from ffmpeg stderr output."""
-    start = text.rfind("{")
-    end = text.rfind("}")
-    if start == -1 or end == -1 or end <= start:
-        raise RuntimeError("Could not parse ffmpeg loudnorm JSON output")
-    return json.loads(text[start : end + 1])
+    """Run ffmpeg and return (return_code, stderr tail).
+
+    The loudnorm JSON summary is printed at the very end of stderr and always
+    falls inside the tail kept by the pool.
+    """
+    returncode, stderr = await ffmpeg_pool.run(args)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({returncode}): {stderr[-4000:]}")
+    return returncode, stderr
+
+
+def _extract_last_json_str(text: str) -> dict:
+    """Extract the last JSON object from a complete ffmpeg stderr string.
+
+    Scans backwards for ``{`` and lets ``raw_decode`` validate each candidate,
+    so only the tail of the text is touched in the common case.
+    """
+    idx = len(text)
+    while (idx := text.rfind("{", 0, idx)) != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            return obj
+    raise RuntimeError("Could not parse ffmpeg loudnorm JSON output")
+
+
+def _build_pass2_args(
+    input_path: Path, output_path: Path, audio_format: str, measured: dict, target: dict
+) -> list[str]:
+    """Build the ffmpeg args for the linear loudnorm pass."""
+    return [
+        "-y",
+        "-i", str(input_path),
+        "-vn",
+        "-af", _PASS2_FILTER.format_map({**target, **measured}),
+        "-acodec", _codec_for_format(audio_format),
+        "-ar", "44100",
+        str(output_path),
+    ]
+
+
+async def _loudnorm_single_pass(
+    input_path: Path,
+    output_path: Path,
+    audio_format: str,
+    target_i: float,
+    target_tp: float,
+    target_lra: float,
+) -> Path:
+    """Run one-pass (dynamic) loudnorm — half the ffmpeg work, slightly less exact."""
+    await _run_ffmpeg([
+        "-y",
+        "-i", str(input_path),
+        "-vn",
+        "-af", f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}",
+        "-acodec", _codec_for_format(audio_format),
+        "-ar", "44100",
+        str(output_path),
+    ])
+    return output_path
 
 
 async def loudnorm_two_pass(
@@ -50,8 +100,18 @@ async def loudnorm_two_pass(
     target_i: float = -14.0,
     target_tp: float = -1.0,
     target_lra: float = 11.0,
+    single_pass: bool = False,
 ) -> Path:
-    """Run two-pass EBU R128 loudness normalization. Returns output path."""
+    """Run two-pass EBU R128 loudness normalization. Returns output path.
+
+    With ``single_pass=True`` the analysis pass is skipped and ffmpeg's
+    dynamic loudnorm is applied in one invocation instead.
+    """
+    if single_pass:
+        return await _loudnorm_single_pass(
+            input_path, output_path, audio_format, target_i, target_tp, target_lra
+        )
+
     # Pass 1: Analyze
     _, stderr = await _run_ffmpeg([
         "-y",
@@ -61,23 +121,11 @@ async def loudnorm_two_pass(
         "-f", "null",
         "-",
     ])
-    analysis = _extract_last_json(stderr)
+    analysis = _extract_last_json_str(stderr)
 
     # Pass 2: Apply with measured values
-    codec = _codec_for_format(audio_format)
-    loudnorm_filter = (
-        f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}"
-        f":measured_I={analysis['input_i']}:measured_TP={analysis['input_tp']}"
-        f":measured_LRA={analysis['input_lra']}:measured_thresh={analysis['input_thresh']}"
-        f":offset={analysis['target_offset']}:linear=true:print_format=summary"
-    )
-    await _run_ffmpeg([
-        "-y",
-        "-i", str(input_path),
-        "-vn",
-        "-af", loudnorm_filter,
-        "-acodec", codec,
-        "-ar", "44100",
-        str(output_path),
-    ])
+    await _run_ffmpeg(_build_pass2_args(
+        input_path, output_path, audio_format, analysis,
+        {"target_i": target_i, "target_tp": target_tp, "target_lra": target_lra},
+    ))
     return output_path
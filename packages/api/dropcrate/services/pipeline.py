@@ -7,34 +7,145 @@ metadata → classify → download → fingerprint → normalize → tag → fin
 from __future__ import annotations
 
 import asyncio
+import errno
 import hashlib
 import json
 import logging
+import os
 import re
 import shutil
+import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
 from dropcrate import config
 from dropcrate.database import get_db
+from dropcrate.models.internal import PipelineItem
 from dropcrate.models.schemas import QueueStartRequest
 from dropcrate.services import download, fingerprint, harmonic, normalize, tagger, transcode
 from dropcrate.services.classify_heuristic import heuristic_classify
 from dropcrate.services.job_manager import Job, job_manager
 from dropcrate.services.naming import make_rekordbox_filename, sanitize_file_component
-from dropcrate.services.title_parser import normalize_from_youtube_title
-from dropcrate.services.metadata import fetch_video_info
+from dropcrate.services.title_parser import has_artist_title_separator, normalize_from_youtube_title
+from dropcrate.services.metadata import canonical_url, fetch_video_info
 
 
 logger = logging.getLogger(__name__)
 
-MAX_CONCURRENT = 3
+MAX_CONCURRENT = config.MAX_CONCURRENT
 
 # Stores pipeline context for items awaiting user file upload
 # Key: item_id, Value: dict with all metadata needed to resume from fingerprint stage
 _pending_uploads: dict[str, dict] = {}
 
+_INSERT_TRACK_SQL = """INSERT OR REPLACE INTO library_tracks
+   (id, file_path, sidecar_path, artist, title, genre, bpm, key, hot_cues, energy, time_slot, vibe,
+    source_url, source_id, duration_seconds, audio_format,
+    album, year, label, downloaded_at)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+# Cached yt-dlp video info is considered stale after a day
+_URL_METADATA_TTL = 24 * 3600
+
+# In-flight metadata fetches, so identical URLs in one batch share a single lookup
+_info_fetches: dict[str, asyncio.Task] = {}
+
+
+async def _cached_fetch(url: str) -> dict:
+    """Fetch video info through the persistent ``url_metadata`` cache."""
+    # Same identity as fetch_video_info's in-memory cache (tracking params dropped)
+    url_hash = hashlib.sha1(canonical_url(url).encode()).hexdigest()
+    task = _info_fetches.get(url_hash)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_store(url, url_hash))
+        _info_fetches[url_hash] = task
+        task.add_done_callback(lambda _: _info_fetches.pop(url_hash, None))
+    # Shielded: one cancelled item must not cancel the lookup other items await
+    return dict(await asyncio.shield(task))
+
+
+async def _fetch_and_store(url: str, url_hash: str) -> dict:
+    now = int(time.time())
+    try:
+        db = await get_db()
+        rows = await db.execute_fetchall(
+            "SELECT json FROM url_metadata WHERE url_hash = ? AND ts >= ?",
+            (url_hash, now - _URL_METADATA_TTL),
+        )
+        if rows:
+            return json.loads(rows[0]["json"])
+    except Exception as exc:
+        # A broken cache is a miss, not a metadata failure
+        logger.warning("Could not read cached metadata for %s: %s", url, exc)
+
+    info = await fetch_video_info(url)
+    try:
+        db = await get_db()
+        await db.execute("DELETE FROM url_metadata WHERE ts < ?", (now - _URL_METADATA_TTL,))
+        await db.execute(
+            "INSERT OR REPLACE INTO url_metadata (url_hash, json, ts) VALUES (?, ?, ?)",
+            (url_hash, json.dumps(info), now),
+        )
+        await db.commit()
+    except Exception as exc:
+        logger.warning("Could not cache metadata for %s: %s", url, exc)
+    return info
+
+
+def _fast_move(src: Path, dst: Path) -> None:
+    """Move a file with an atomic rename, copying only across filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.copy2(src, dst)
+        os.unlink(src)
+
+
+async def transcode_and_tag(
+    src: Path,
+    output_path: Path,
+    audio_format: str,
+    tags: dict[str, str],
+    artwork_path: Path | None = None,
+) -> Path:
+    """Encode ``src`` to ``audio_format`` and embed tags/artwork in one ffmpeg run."""
+    await tagger.apply_tags_and_artwork(
+        media_path=src,
+        ext=output_path.suffix,
+        tags=tags,
+        artwork_path=artwork_path,
+        output_path=output_path,
+        audio_codec=transcode._codec_for_format(audio_format),
+    )
+    return output_path
+
+
+async def _flush_library_rows(job: Job) -> None:
+    """Insert the library rows queued so far in a single transaction.
+
+    Called by each item before it reports ``item-done``; rows queued by items
+    finalizing at the same time go in with the same insert.
+    """
+    async with job.rows_lock:
+        if not job.pending_rows:
+            return
+        rows, job.pending_rows = job.pending_rows, []
+        try:
+            db = await get_db()
+            await db.executemany(_INSERT_TRACK_SQL, rows)
+            await db.commit()
+        except Exception as exc:
+            logger.error("Library insert failed for job %s: %s", job.id, exc)
+            job_manager.broadcast(job, {
+                "type": "warning",
+                "job_id": job.id,
+                "message": f"Saving tracks to the library failed: {exc}",
+            })
+
 
 async def _maybe_generate_rekordbox_xml(job: Job, inbox_dir: Path) -> None:
     """Generate rekordbox XML after a batch if the setting is enabled.
@@ -83,18 +194,19 @@ async def run_pipeline(job: Job, req: QueueStartRequest) -> None:
     """Main pipeline entry point. Runs as a background task."""
     inbox_dir = Path(req.inbox_dir)
     inbox_dir.mkdir(parents=True, exist_ok=True)
+    items = [PipelineItem.from_input(item) for item in req.items]
 
     job_manager.broadcast(job, {
         "type": "queue-start",
         "job_id": job.id,
-        "count": len(req.items),
+        "count": len(items),
         "inbox_dir": str(inbox_dir),
         "mode": req.mode.value,
     })
 
-    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    sem = asyncio.Semaphore(min(len(items), MAX_CONCURRENT))
     tasks = []
-    for item in req.items:
+    for item in items:
         tasks.append(_process_with_semaphore(sem, job, req, item, inbox_dir))
 
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -102,7 +214,7 @@ async def run_pipeline(job: Job, req: QueueStartRequest) -> None:
     # Log any silently swallowed exceptions from gather
     for i, result in enumerate(results):
         if isinstance(result, Exception):
-            item = req.items[i]
+            item = items[i]
             logger.error(f"Unhandled exception for item {item.id} ({item.url}): {result}")
             job_manager.broadcast(job, {
                 "type": "item-error",
@@ -112,6 +224,11 @@ async def run_pipeline(job: Job, req: QueueStartRequest) -> None:
                 "error": str(result),
             })
 
+    # Wait for background tag/DB finalization before the batch is reported done
+    if job.pending_tasks:
+        await asyncio.gather(*job.pending_tasks, return_exceptions=True)
+        job.pending_tasks.clear()
+
     # Generate rekordbox XML with auto-playlists for completed tracks
     await _maybe_generate_rekordbox_xml(job, inbox_dir)
 
@@ -132,7 +249,9 @@ async def _process_with_semaphore(sem, job, req, item, inbox_dir):
         await _process_one(job, req, item, inbox_dir)
 
 
-async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path) -> None:
+async def _process_one(
+    job: Job, req: QueueStartRequest, item: PipelineItem, inbox_dir: Path
+) -> None:
     """Process a single queue item through the full pipeline."""
     url = item.url
     dj_defaults = item.preset_snapshot
@@ -155,7 +274,7 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
         # Stage 1: Metadata
         progress("metadata")
         try:
-            info = await fetch_video_info(url)
+            info = await _cached_fetch(url)
         except Exception as meta_err:
             logger.warning(f"[pipeline] Metadata extraction failed for {url}: {meta_err}")
             # Extract video ID from URL for minimal context
@@ -208,22 +327,31 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
 
         # Parse title
         raw_title = (info.get("title") or "Unknown Title").strip()
-        title_had_separator = bool(re.search(r"(\s-\s|\s\u2013\s|\s\u2014\s|\s\|\s)", raw_title))
+        title_had_separator = has_artist_title_separator(raw_title)
         normalized = normalize_from_youtube_title(raw_title, info.get("uploader"))
 
         base_name = sanitize_file_component(f"{normalized.artist} - {normalized.title}".strip())
         work_dir = inbox_dir / f".dropcrate_tmp_{source_id}"
         work_dir.mkdir(parents=True, exist_ok=True)
 
+        finalize_scheduled = False
         try:
             if job.cancel_requested:
                 raise RuntimeError("Cancelled")
 
             # Stage 3: Download
             progress("download")
+            # The thumbnail only needs the info, so fetch it while the audio downloads
+            thumb_url = tagger.pick_best_thumbnail_url(info)
+            thumb_task = (
+                asyncio.create_task(tagger.download_thumbnail(thumb_url, work_dir / "cover.jpg"))
+                if thumb_url else None
+            )
             try:
                 downloaded_path = await download.download_audio(url, work_dir)
             except Exception as dl_err:
+                if thumb_task:
+                    thumb_task.cancel()
                 logger.warning(f"[pipeline] Download failed for {url}: {dl_err}")
                 # Store pipeline context so upload endpoint can resume
                 _pending_uploads[item.id] = {
@@ -253,11 +381,7 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
 
             downloaded_ext = downloaded_path.suffix.lower()
 
-            # Download thumbnail
-            thumb_url = tagger.pick_best_thumbnail_url(info)
-            thumb_path = None
-            if thumb_url:
-                thumb_path = await tagger.download_thumbnail(thumb_url, work_dir / "cover.jpg")
+            thumb_path = await thumb_task if thumb_task else None
 
             if job.cancel_requested:
                 raise RuntimeError("Cancelled")
@@ -313,8 +437,7 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
 
             # Determine output format and extension
             audio_format = req.audio_format.value
-            ext_map = {"aiff": ".aiff", "wav": ".wav", "flac": ".flac", "mp3": ".mp3"}
-            final_ext = ext_map.get(audio_format, ".aiff")
+            final_ext = normalize._ext_for_format(audio_format)
 
             final_filename = make_rekordbox_filename(
                 artist=tags.get("artist", "Unknown"),
@@ -326,7 +449,9 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
             final_path = inbox_dir / final_filename
 
             # Stage 5: Normalize or Transcode
-            if req.normalize_enabled and req.mode.value == "dj-safe":
+            # Fast mode normalizes in a single ffmpeg pass instead of two.
+            needs_transcode = False
+            if req.normalize_enabled:
                 progress("normalize")
                 tmp_path = work_dir / f"output{final_ext}"
                 await normalize.loudnorm_two_pass(
@@ -336,120 +461,136 @@ async def _process_one(job: Job, req: QueueStartRequest, item, inbox_dir: Path)
                     target_i=req.loudness.target_i,
                     target_tp=req.loudness.target_tp,
                     target_lra=req.loudness.target_lra,
+                    single_pass=req.mode.value == "fast",
                 )
-                shutil.move(str(tmp_path), str(final_path))
+                staged_path = tmp_path
             else:
                 progress("transcode")
-                # Check if we can just rename (same format, no normalization)
-                is_same_format = (
-                    (downloaded_ext == ".m4a" and audio_format == "mp3")
-                    or downloaded_ext == final_ext
-                )
-                if not req.normalize_enabled and is_same_format and downloaded_ext == final_ext:
-                    shutil.move(str(downloaded_path), str(final_path))
-                else:
-                    tmp_path = work_dir / f"output{final_ext}"
-                    await transcode.transcode(downloaded_path, tmp_path, audio_format)
-                    shutil.move(str(tmp_path), str(final_path))
-
-            # Stage 6: Tag
-            progress("tag")
-            await tagger.apply_tags_and_artwork(
-                media_path=final_path,
-                ext=final_ext,
-                tags=tags,
-                artwork_path=thumb_path,
-            )
-
-            # Stage 7: Finalize
-            progress("finalize")
-
-            # Write sidecar JSON
-            sidecar = {
-                "sourceUrl": source_url,
-                "sourceId": source_id,
-                "title": info.get("title"),
-                "uploader": info.get("uploader"),
-                "duration": info.get("duration"),
-                "downloadedAt": datetime.now(timezone.utc).isoformat(),
-                "normalized": {
-                    "artist": effective_artist,
-                    "title": effective_title,
-                    "version": effective_version,
-                    "album": effective_album,
-                    "year": effective_year,
-                    "label": effective_label,
-                    "bpm": bpm if bpm > 0 else None,
-                    "key": camelot_key if camelot_key else None,
-                    "hotCues": hot_cues,
-                },
-                "djDefaults": {
-                    "genre": effective_genre,
-                    "energy": effective_energy,
-                    "time": effective_time,
-                    "vibe": effective_vibe,
-                },
-                "processing": {
-                    "audioFormat": audio_format,
-                    "normalize": {
-                        "enabled": req.normalize_enabled,
-                        "targetI": req.loudness.target_i,
-                        "targetTP": req.loudness.target_tp,
-                        "targetLRA": req.loudness.target_lra,
-                    },
-                },
-                "outputs": {"audioPath": str(final_path)},
-            }
-            sidecar_name = sanitize_file_component(
-                f"{effective_artist} - {effective_title}".strip()
-            )
-            sidecar_path = inbox_dir / f"{sidecar_name}.dropcrate.json"
-            sidecar_path.write_text(json.dumps(sidecar, indent=2))
-
-            # Insert into library database
-            track_id = str(uuid.uuid4())[:8]
-            db = await get_db()
-            await db.execute(
-                """INSERT OR REPLACE INTO library_tracks
-                   (id, file_path, sidecar_path, artist, title, genre, bpm, key, hot_cues, energy, time_slot, vibe,
-                    source_url, source_id, duration_seconds, audio_format,
-                    album, year, label, downloaded_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    track_id,
-                    str(final_path),
-                    str(sidecar_path),
-                    effective_artist,
-                    effective_title,
-                    effective_genre,
-                    bpm if bpm > 0 else None,
-                    camelot_key if camelot_key else None,
-                    json.dumps(hot_cues) if hot_cues else None,
-                    effective_energy,
-                    effective_time,
-                    effective_vibe,
-                    source_url,
-                    source_id,
-                    info.get("duration"),
-                    audio_format,
-                    effective_album or None,
-                    effective_year or None,
-                    effective_label or None,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
-            )
-            await db.commit()
-
-            # Track completed IDs for batch XML generation
-            job.completed_ids.append(track_id)
-
-            job_manager.broadcast(job, {
-                "type": "item-done", "job_id": job.id, "item_id": item.id, "url": url
-            })
+                # Same format is tagged as-is; otherwise the encode is folded
+                # into the tagging run below
+                needs_transcode = downloaded_ext != final_ext
+                staged_path = downloaded_path
+
+            async def finalize() -> None:
+                try:
+                    # Stage 6: Tag
+                    progress("tag")
+                    # The tagging remux writes straight into the inbox, so the
+                    # staged audio is never moved or rewritten in place.
+                    if needs_transcode:
+                        await transcode_and_tag(
+                            staged_path, final_path, audio_format, tags, thumb_path
+                        )
+                    else:
+                        await tagger.apply_tags_and_artwork(
+                            media_path=staged_path,
+                            ext=final_ext,
+                            tags=tags,
+                            artwork_path=thumb_path,
+                            output_path=final_path,
+                        )
+
+                    # Stage 7: Finalize
+                    progress("finalize")
+
+                    # Write sidecar JSON
+                    sidecar = {
+                        "sourceUrl": source_url,
+                        "sourceId": source_id,
+                        "title": info.get("title"),
+                        "uploader": info.get("uploader"),
+                        "duration": info.get("duration"),
+                        "downloadedAt": datetime.now(timezone.utc).isoformat(),
+                        "normalized": {
+                            "artist": effective_artist,
+                            "title": effective_title,
+                            "version": effective_version,
+                            "album": effective_album,
+                            "year": effective_year,
+                            "label": effective_label,
+                            "bpm": bpm if bpm > 0 else None,
+                            "key": camelot_key if camelot_key else None,
+                            "hotCues": hot_cues,
+                        },
+                        "djDefaults": {
+                            "genre": effective_genre,
+                            "energy": effective_energy,
+                            "time": effective_time,
+                            "vibe": effective_vibe,
+                        },
+                        "processing": {
+                            "audioFormat": audio_format,
+                            "normalize": {
+                                "enabled": req.normalize_enabled,
+                                "targetI": req.loudness.target_i,
+                                "targetTP": req.loudness.target_tp,
+                                "targetLRA": req.loudness.target_lra,
+                            },
+                        },
+                        "outputs": {"audioPath": str(final_path)},
+                    }
+                    sidecar_name = sanitize_file_component(
+                        f"{effective_artist} - {effective_title}".strip()
+                    )
+                    sidecar_path = inbox_dir / f"{sidecar_name}.dropcrate.json"
+                    sidecar_path.write_text(json.dumps(sidecar, indent=2))
+
+                    # Queue the library row and save it before the item is reported
+                    # done; rows from items finalizing at the same time share the insert
+                    track_id = str(uuid.uuid4())[:8]
+                    job.pending_rows.append((
+                        track_id,
+                        str(final_path),
+                        str(sidecar_path),
+                        effective_artist,
+                        effective_title,
+                        effective_genre,
+                        bpm if bpm > 0 else None,
+                        camelot_key if camelot_key else None,
+                        json.dumps(hot_cues) if hot_cues else None,
+                        effective_energy,
+                        effective_time,
+                        effective_vibe,
+                        source_url,
+                        source_id,
+                        info.get("duration"),
+                        audio_format,
+                        effective_album or None,
+                        effective_year or None,
+                        effective_label or None,
+                        datetime.now(timezone.utc).isoformat(),
+                    ))
+
+                    await _flush_library_rows(job)
+
+                    # Track completed IDs for batch XML generation
+                    job.completed_ids.append(track_id)
+
+                    job_manager.broadcast(job, {
+                        "type": "item-done", "job_id": job.id, "item_id": item.id, "url": url
+                    })
+                except Exception as e:
+                    logger.error(f"[pipeline] Finalize failed for {url}: {e}")
+                    job_manager.broadcast(job, {
+                        "type": "item-error",
+                        "job_id": job.id,
+                        "item_id": item.id,
+                        "url": url,
+                        "error": str(e),
+                    })
+                finally:
+                    # Clean up work directory
+                    shutil.rmtree(str(work_dir), ignore_errors=True)
+
+            # Tag/sidecar/DB insert run off the critical path so the next
+            # queued item can start downloading while this one finalizes.
+            job.pending_tasks.append(asyncio.create_task(finalize()))
+            finalize_scheduled = True
 
         finally:
-            # Clean up work directory
-            shutil.rmtree(str(work_dir), ignore_errors=True)
+            if not finalize_scheduled:
+                # Clean up work directory
+                shutil.rmtree(str(work_dir), ignore_errors=True)
 
     except Exception as e:
         import traceback
@@ -5,12 +5,13 @@ Port of applyTagsAndArtwork() from downloadOne.ts.
 
 from __future__ import annotations
 
-import asyncio
-import shutil
+import os
 from pathlib import Path
 
 import httpx
 
+from dropcrate.services import ffmpeg_pool
+
 
 async def download_thumbnail(url: str, dest: Path) -> Path | None:
     """Download a thumbnail image. Returns path or None on failure."""
@@ -26,18 +27,15 @@ async def download_thumbnail(url: str, dest: Path) -> Path | None:
 
 def pick_best_thumbnail_url(info: dict) -> str | None:
     """Pick the best available thumbnail URL from yt-dlp info."""
-    thumbnails = info.get("thumbnails") or []
-    scored = []
-    for t in thumbnails:
-        url = t.get("url")
-        if not url:
-            continue
-        score = (t.get("width") or 0) * (t.get("height") or 0) + (t.get("preference") or 0)
-        scored.append((score, url))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    if scored:
-        return scored[0][1]
-    return info.get("thumbnail")
+    thumbnails = [t for t in info.get("thumbnails") or [] if t.get("url")]
+    if not thumbnails:
+        return info.get("thumbnail")
+    # Single pass; on equal scores the earliest entry wins
+    best = max(
+        thumbnails,
+        key=lambda t: (t.get("width") or 0) * (t.get("height") or 0) + (t.get("preference") or 0),
+    )
+    return best["url"]
 
 
 def _build_tags(
@@ -91,17 +89,9 @@ def _build_tags(
 
 
 async def _run_ffmpeg(args: list[str]) -> None:
-    proc = await asyncio.create_subprocess_exec(
-        "ffmpeg",
-        *args,
-        stdin=asyncio.subprocess.DEVNULL,
-        stdout=asyncio.subprocess.DEVNULL,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    _, stderr_bytes = await proc.communicate()
-    if proc.returncode != 0:
-        stderr = stderr_bytes.decode("utf-8", errors="replace")
-        raise RuntimeError(f"ffmpeg tagging failed ({proc.returncode}): {stderr[-4000:]}")
+    returncode, stderr = await ffmpeg_pool.run(args)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg tagging failed ({returncode}): {stderr[-4000:]}")
 
 
 async def apply_tags_and_artwork(
@@ -109,9 +99,19 @@ async def apply_tags_and_artwork(
     ext: str,
     tags: dict[str, str],
     artwork_path: Path | None = None,
+    output_path: Path | None = None,
+    audio_codec: str | None = None,
 ) -> None:
-    """Apply ID3/Vorbis metadata tags and optional artwork to an audio file."""
-    tmp = media_path.with_suffix(f".tagged.tmp{ext}")
+    """Apply ID3/Vorbis metadata tags and optional artwork to an audio file.
+
+    By default ``media_path`` is replaced in place. When ``output_path`` is
+    given the tagged file is written there directly and ``media_path`` is left
+    untouched, saving a temp file and a move. When ``audio_codec`` is given the
+    audio is encoded with it at 44.1kHz instead of stream-copied, so transcoding
+    and tagging happen in a single ffmpeg run.
+    """
+    tmp = output_path or media_path.with_suffix(f".tagged.tmp{ext}")
+    done = False
     try:
         meta_args_global = []
         meta_args_audio = []
@@ -119,40 +119,44 @@ async def apply_tags_and_artwork(
             meta_args_global.extend(["-metadata", f"{k}={v}"])
             meta_args_audio.extend(["-metadata:s:a:0", f"{k}={v}"])
 
+        if audio_codec:
+            audio_args = ["-c:a", audio_codec, "-ar", "44100"]
+        else:
+            audio_args = ["-c:a", "copy"]
+
+        if ext == ".mp3":
+            container_args = ["-id3v2_version", "3"]
+        elif ext in (".aiff", ".wav"):
+            container_args = ["-write_id3v2", "1"]
+        else:
+            container_args = []
+
         if not artwork_path:
             # No artwork — just remux with tags
-            if ext == ".mp3":
-                args = ["-y", "-i", str(media_path), *meta_args_global, *meta_args_audio,
-                        "-c", "copy", "-id3v2_version", "3", str(tmp)]
-            elif ext == ".flac":
-                args = ["-y", "-i", str(media_path), *meta_args_global, *meta_args_audio,
-                        "-c", "copy", str(tmp)]
-            elif ext in (".aiff", ".wav"):
-                args = ["-y", "-i", str(media_path), *meta_args_global, *meta_args_audio,
-                        "-c", "copy", "-write_id3v2", "1", str(tmp)]
+            if audio_codec:
+                stream_args = ["-vn", *audio_args]
             else:
-                args = ["-y", "-i", str(media_path), *meta_args_global, *meta_args_audio,
-                        "-c", "copy", str(tmp)]
+                stream_args = ["-c", "copy"]
+            args = ["-y", "-i", str(media_path), *meta_args_global, *meta_args_audio,
+                    *stream_args, *container_args, str(tmp)]
         else:
             # Artwork + metadata
-            base_args = [
+            args = [
                 "-y", "-i", str(media_path), "-i", str(artwork_path),
                 *meta_args_global, *meta_args_audio,
                 "-map", "0:a:0", "-map", "1:v:0",
-                "-c:a", "copy", "-c:v", "mjpeg",
+                *audio_args, "-c:v", "mjpeg",
                 "-disposition:v:0", "attached_pic",
                 "-metadata:s:v:0", "title=Album cover",
                 "-metadata:s:v:0", "comment=Cover (front)",
+                *container_args, str(tmp),
             ]
-            if ext == ".mp3":
-                args = [*base_args, "-id3v2_version", "3", str(tmp)]
-            elif ext in (".aiff", ".wav"):
-                args = [*base_args, "-write_id3v2", "1", str(tmp)]
-            else:
-                args = [*base_args, str(tmp)]
 
         await _run_ffmpeg(args)
-        shutil.move(str(tmp), str(media_path))
+        if output_path is None:
+            # tmp sits next to media_path, so this is always a same-filesystem rename
+            os.replace(tmp, media_path)
+        done = True
     finally:
-        if tmp.exists():
+        if not done or output_path is None:
             tmp.unlink(missing_ok=True)
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass
 
-JUNK_TITLE_PATTERNS = [
-    re.compile(r"\b(official\s+video|official\s+music\s+video)\b", re.I),
-    re.compile(r"\b(official\s+audio)\b", re.I),
-    re.compile(r"\b(lyric\s+video|lyrics?)\b", re.I),
-    re.compile(r"\b(visuali[sz]er)\b", re.I),
-    re.compile(r"\b(hd|4k|8k)\b", re.I),
-    re.compile(r"\b(full\s+album)\b", re.I),
-]
+# All junk tokens in one alternation so the title is scanned once
+JUNK_TITLE_RE = re.compile(
+    r"\b(official\s+video|official\s+music\s+video"
+    r"|official\s+audio"
+    r"|lyric\s+video|lyrics?"
+    r"|visuali[sz]er"
+    r"|hd|4k|8k"
+    r"|full\s+album)\b",
+    re.I,
+)
 
 VERSION_HINTS = [
     "original mix",
@@ -29,8 +32,25 @@ VERSION_HINTS = [
     "mix",
 ]
 
-UPPER_WORDS = {"dj", "mc", "ii", "iii", "iv", "uk", "us", "nyc", "la", "dc", "aka"}
-LOWER_WORDS = {"the", "a", "an", "and", "or", "of", "vs", "vs.", "feat", "feat.", "ft", "ft.", "x"}
+# Compiled once at import; these run for every ingested title
+_BRACKETED_RE = re.compile(r"\[[^\]]*\]")
+_EMPTY_PARENS_RE = re.compile(r"\(\s*\)")
+_TRAILING_PARENS_RE = re.compile(r"\(([^)]{2,80})\)\s*$")
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_SEPARATOR_SPLIT_RE = re.compile(r"(\s+|[-&])")
+
+# Artist/title separators, in priority order: the first kind present wins
+_SEPARATORS = (" - ", " \u2013 ", " \u2014 ", " | ")
+# Any separator surrounded by whitespace, found in one scan
+_ANY_SEPARATOR_RE = re.compile(r"\s[-\u2013\u2014|]\s")
+
+# Any hint as a plain substring of the lowercased parenthetical, in one search
+_VERSION_HINT_RE = re.compile("|".join(map(re.escape, VERSION_HINTS)))
+
+UPPER_WORDS = frozenset({"dj", "mc", "ii", "iii", "iv", "uk", "us", "nyc", "la", "dc", "aka"})
+LOWER_WORDS = frozenset(
+    {"the", "a", "an", "and", "or", "of", "vs", "vs.", "feat", "feat.", "ft", "ft.", "x"}
+)
 
 CORRECTIONS: dict[str, str] = {
     "jay-z": "JAY-Z",
@@ -47,14 +67,26 @@ CORRECTIONS: dict[str, str] = {
     "m.c.": "MC",
 }
 
+# Every correction as a standalone token anywhere in the name, matched in one
+# scan; longest first so "j. cole" wins over a shorter overlapping key
+_CORRECTIONS_RE = re.compile(
+    r"(?<!\w)("
+    + "|".join(re.escape(k) for k in sorted(CORRECTIONS, key=len, reverse=True))
+    + r")(?!\w)",
+    re.IGNORECASE,
+)
+
 
-@dataclass
+# Slots: no per-instance __dict__ for the results the lru_cache below holds on to
+@dataclass(frozen=True, slots=True)
 class NormalizedMetadata:
     artist: str
     title: str
     version: str | None
 
 
+# Titles repeat across playlists and re-queued items; results are frozen, so share them
+@functools.lru_cache(maxsize=8192)
 def normalize_from_youtube_title(raw_title: str, uploader: str | None = None) -> NormalizedMetadata:
     raw = (raw_title or "").strip()
     uploader = (uploader or "").strip()
@@ -62,15 +94,18 @@ def normalize_from_youtube_title(raw_title: str, uploader: str | None = None) ->
     title = raw
 
     # Remove bracketed noise
-    title = re.sub(r"\[[^\]]*\]", " ", title).strip()
+    title = _BRACKETED_RE.sub(" ", title).strip()
 
     # Remove common junk tokens
-    for pattern in JUNK_TITLE_PATTERNS:
-        title = pattern.sub(" ", title)
+    # Repeat while something matched: removing one token can join the words
+    # of another ("Full Lyrics Album"); titles without junk take a single pass
+    count = 1
+    while count:
+        title, count = JUNK_TITLE_RE.subn(" ", title)
     title = _clean_spaces(title)
 
     # Remove empty parentheses left behind
-    title = re.sub(r"\(\s*\)", " ", title)
+    title = _EMPTY_PARENS_RE.sub(" ", title)
     title = _clean_spaces(title)
 
     # Split on common artist-title separators
@@ -93,9 +128,13 @@ def normalize_from_youtube_title(raw_title: str, uploader: str | None = None) ->
     )
 
 
+def has_artist_title_separator(title: str) -> bool:
+    """True if ``title`` contains an artist/title separator such as " - "."""
+    return _ANY_SEPARATOR_RE.search(title) is not None
+
+
 def _split_artist_title(value: str) -> tuple[str | None, str | None]:
-    separators = [" - ", " \u2013 ", " \u2014 ", " | "]
-    for sep in separators:
+    for sep in _SEPARATORS:
         idx = value.find(sep)
         if idx > 0:
             left = value[:idx].strip()
@@ -106,14 +145,13 @@ def _split_artist_title(value: str) -> tuple[str | None, str | None]:
 
 
 def _extract_version(title: str) -> tuple[str, str | None]:
-    match = re.search(r"\(([^)]{2,80})\)\s*$", title)
+    match = _TRAILING_PARENS_RE.search(title)
     if not match:
         return _clean_spaces(title), None
 
     inside = _clean_spaces(match.group(1))
     normalized = inside.lower()
-    is_versiony = any(h in normalized for h in VERSION_HINTS)
-    if not is_versiony:
+    if not _VERSION_HINT_RE.search(normalized):
         return _clean_spaces(title), None
 
     stripped = _clean_spaces(title[: match.start()].strip())
@@ -121,7 +159,7 @@ def _extract_version(title: str) -> tuple[str, str | None]:
 
 
 def _clean_spaces(value: str) -> str:
-    return re.sub(r"\s+", " ", value).strip()
+    return _WHITESPACE_RE.sub(" ", value).strip()
 
 
 def _to_title_case_artist(name: str) -> str:
@@ -129,43 +167,42 @@ def _to_title_case_artist(name: str) -> str:
     if not trimmed:
         return trimmed
 
-    lower_name = trimmed.lower()
-    if lower_name in CORRECTIONS:
-        return CORRECTIONS[lower_name]
-
-    # Split on whitespace, hyphens, ampersands (keeping separators)
-    words = re.split(r"(\s+|[-&])", trimmed)
+    # Known spellings first; split() leaves the matched keys at odd indexes
+    parts = _CORRECTIONS_RE.split(trimmed)
     result: list[str] = []
+    seen_word = False
 
-    for word in words:
-        if not word:
+    for i, part in enumerate(parts):
+        if i % 2:
+            result.append(CORRECTIONS[part.lower()])
+            seen_word = True
             continue
 
-        # Preserve separators as-is
-        if re.match(r"^(\s+|[-&])$", word):
-            result.append(word)
-            continue
+        # Split on whitespace, hyphens, ampersands; separators land at odd indexes
+        for j, word in enumerate(_WORD_SEPARATOR_SPLIT_RE.split(part)):
+            if not word:
+                continue
 
-        lower = word.lower()
+            # Preserve separators as-is
+            if j % 2:
+                result.append(word)
+                continue
 
-        # Check word-level corrections
-        if lower in CORRECTIONS:
-            result.append(CORRECTIONS[lower])
-            continue
+            lower = word.lower()
+            is_first_word = not seen_word
+            seen_word = True
 
-        # Uppercase words
-        if lower in UPPER_WORDS:
-            result.append(word.upper())
-            continue
+            # Uppercase words
+            if lower in UPPER_WORDS:
+                result.append(word.upper())
+                continue
 
-        # Lowercase words (unless first real word)
-        real_words = [w for w in result if not re.match(r"^(\s+|[-&])$", w)]
-        is_first_word = len(real_words) == 0
-        if lower in LOWER_WORDS and not is_first_word:
-            result.append(lower)
-            continue
+            # Lowercase words (unless first real word)
+            if lower in LOWER_WORDS and not is_first_word:
+                result.append(lower)
+                continue
 
-        # Default: capitalize first letter
-        result.append(word[0].upper() + word[1:].lower() if len(word) > 1 else word.upper())
+            # Default: capitalize first letter
+            result.append(word[0].upper() + word[1:].lower() if len(word) > 1 else word.upper())
 
     return "".join(result)
@@ -3,32 +3,92 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from pathlib import Path
 
+from dropcrate.services import download, ffmpeg_pool
+
+_CODECS = {"aiff": "pcm_s16be", "wav": "pcm_s16le", "flac": "flac", "mp3": "libmp3lame"}
+# ffprobe's codec_name for what each encoder above produces
+_STREAM_CODECS = {"aiff": "pcm_s16be", "wav": "pcm_s16le", "flac": "flac", "mp3": "mp3"}
+# YouTube's AAC/Opus downloads never match a target codec, so they are not probed
+_NEVER_COPYABLE = {".m4a", ".webm", ".opus", ".aac"}
+
 
 def _codec_for_format(fmt: str) -> str:
-    return {"aiff": "pcm_s16be", "wav": "pcm_s16le", "flac": "flac", "mp3": "libmp3lame"}.get(
-        fmt, "pcm_s16be"
-    )
+    return _CODECS.get(fmt, "pcm_s16be")
 
 
-async def transcode(input_path: Path, output_path: Path, audio_format: str) -> Path:
-    """Transcode audio to the specified format at 44.1kHz. Returns output path."""
-    codec = _codec_for_format(audio_format)
-    proc = await asyncio.create_subprocess_exec(
-        "ffmpeg",
+def _transcode_args(input_spec: str, output_path: Path, audio_format: str) -> list[str]:
+    return [
         "-y",
-        "-i", str(input_path),
+        "-i", input_spec,
         "-vn",
-        "-acodec", codec,
+        "-acodec", _codec_for_format(audio_format),
         "-ar", "44100",
         str(output_path),
-        stdin=asyncio.subprocess.DEVNULL,
-        stdout=asyncio.subprocess.DEVNULL,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    _, stderr_bytes = await proc.communicate()
-    if proc.returncode != 0:
-        stderr = stderr_bytes.decode("utf-8", errors="replace")
-        raise RuntimeError(f"ffmpeg transcode failed ({proc.returncode}): {stderr[-4000:]}")
+    ]
+
+
+async def _can_stream_copy(input_path: Path, audio_format: str) -> bool:
+    """True if the first audio stream is already the target codec at 44.1kHz."""
+    if input_path.suffix.lower() in _NEVER_COPYABLE:
+        return False
+    try:
+        returncode, stdout = await ffmpeg_pool.probe([
+            "-v", "quiet",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name,sample_rate",
+            "-of", "csv=p=0",
+            str(input_path),
+        ])
+    except OSError:
+        return False
+    if returncode != 0:
+        return False
+    return stdout.strip() == f"{_STREAM_CODECS.get(audio_format, 'pcm_s16be')},44100"
+
+
+async def transcode(input_path: Path, output_path: Path, audio_format: str) -> Path:
+    """Transcode audio to the specified format at 44.1kHz. Returns output path.
+
+    If the input already holds the target codec at 44.1kHz (e.g. an ``.aif``
+    upload going to AIFF), the stream is copied into the new container instead.
+    """
+    if await _can_stream_copy(input_path, audio_format):
+        args = ["-y", "-i", str(input_path), "-vn", "-c:a", "copy", str(output_path)]
+    else:
+        args = _transcode_args(str(input_path), output_path, audio_format)
+    returncode, stderr = await ffmpeg_pool.run(args)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg transcode failed ({returncode}): {stderr[-4000:]}")
+    return output_path
+
+
+async def download_and_transcode(url: str, output_path: Path, audio_format: str) -> Path:
+    """Pipe yt-dlp's audio straight into ffmpeg, skipping the downloaded file."""
+    read_fd, write_fd = os.pipe()
+    try:
+        downloader = await download.download_audio_stream(url, stdout=write_fd)
+    except BaseException:
+        os.close(read_fd)
+        raise
+    finally:
+        # The child holds its own copy; closing ours lets ffmpeg see EOF
+        os.close(write_fd)
+
+    try:
+        (returncode, stderr), dl_stderr = await asyncio.gather(
+            ffmpeg_pool.run(_transcode_args("pipe:0", output_path, audio_format), stdin=read_fd),
+            # Bounded tail rather than communicate(), which buffers all of it
+            ffmpeg_pool.read_stderr_tail(downloader),
+        )
+    finally:
+        os.close(read_fd)
+
+    if downloader.returncode != 0:
+        dl_err = dl_stderr.strip()
+        raise RuntimeError(f"yt-dlp stream failed ({downloader.returncode}): {dl_err[-1500:]}")
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg transcode failed ({returncode}): {stderr[-4000:]}")
     return output_path
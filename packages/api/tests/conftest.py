@@ -3,14 +3,37 @@ import os
 import tempfile
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", default=False, help="run tests marked slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow; pass --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
 
 
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when available (ships with uvicorn[standard])."""
+    try:
+        import uvloop
+    except ImportError:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
 @pytest.fixture(autouse=True)
 async def _isolated_db(tmp_path):
     """Use a temporary database for each test to avoid cross-test pollution."""
@@ -31,8 +54,14 @@ async def _isolated_db(tmp_path):
     config.DATABASE_PATH = original_db_path
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client():
+    """One ASGI client for the whole session.
+
+    The client holds no app state of its own: requests run on the calling
+    test's loop, and the autouse ``_isolated_db`` fixture gives each test a
+    fresh database, so settings and queue state never leak between tests.
+    """
     from dropcrate.main import app
 
     transport = ASGITransport(app=app)
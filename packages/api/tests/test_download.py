@@ -1,9 +1,10 @@
 """Tests for the yt-dlp download service (mocked)."""
 
 import asyncio
-import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 
 @pytest.mark.asyncio
@@ -84,3 +85,34 @@ async def test_download_uses_cookies_config():
             _sync_download("https://www.youtube.com/watch?v=test", Path("/tmp"))
             opts = mock_cls.call_args[0][0]
             assert opts["cookiesfrombrowser"] == ("chrome",)
+
+
+def test_primary_cmd_passes_shared_cache_dir():
+    """A configured yt-dlp cache dir is passed to every yt-dlp invocation."""
+    from dropcrate.services.download import _primary_cmd
+
+    with patch("dropcrate.config.YTDLP_CACHE_DIR", "/data/yt-dlp-cache"):
+        cmd = _primary_cmd("-")
+    assert cmd[:3] == ["yt-dlp", "--cache-dir", "/data/yt-dlp-cache"]
+
+    with patch("dropcrate.config.YTDLP_CACHE_DIR", ""):
+        assert "--cache-dir" not in _primary_cmd("-")
+
+
+def test_download_with_info_reads_and_removes_info_json(tmp_path):
+    """The info comes from yt-dlp's .info.json sibling, which is then removed."""
+    from dropcrate.services.download import _sync_download_with_info
+
+    def fake_run(cmd, **kwargs):
+        assert "--write-info-json" in cmd
+        (tmp_path / "Artist - Title.m4a").write_bytes(b"audio")
+        info_json = '{"id": "abc123", "title": "Artist - Title"}'
+        (tmp_path / "Artist - Title.info.json").write_text(info_json)
+        return MagicMock(returncode=0, stderr=b"")
+
+    with patch("dropcrate.services.download.subprocess.run", side_effect=fake_run):
+        path, info = _sync_download_with_info("https://www.youtube.com/watch?v=abc123", tmp_path)
+
+    assert path == tmp_path / "Artist - Title.m4a"
+    assert info["id"] == "abc123"
+    assert not (tmp_path / "Artist - Title.info.json").exists()
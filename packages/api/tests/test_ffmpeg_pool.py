@@ -0,0 +1,132 @@
+"""Tests for the shared ffmpeg runner (mocked subprocess)."""
+
+import asyncio
+import sys
+import weakref
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dropcrate.services import ffmpeg_pool
+
+_SUBPROCESS_EXEC = "dropcrate.services.ffmpeg_pool.asyncio.create_subprocess_exec"
+
+
+def _mock_proc(returncode=0, stderr_lines=()):
+    proc = AsyncMock()
+    proc.returncode = returncode
+    proc.stderr.read.side_effect = [*stderr_lines, b""]
+    return proc
+
+
+@pytest.mark.asyncio
+async def test_run_returns_code_and_stderr():
+    proc = _mock_proc(0, [b"line one\n", b"line two\n"])
+    with patch(_SUBPROCESS_EXEC, return_value=proc) as mock_exec:
+        rc, stderr = await ffmpeg_pool.run(["-i", "in.m4a", "out.aiff"])
+
+    assert rc == 0
+    assert stderr == "line one\nline two\n"
+    assert mock_exec.call_args[0] == (
+        "ffmpeg", "-hide_banner", "-nostats", "-i", "in.m4a", "out.aiff"
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_does_not_raise_on_failure():
+    proc = _mock_proc(1, [b"Error: invalid input\n"])
+    with patch(_SUBPROCESS_EXEC, return_value=proc):
+        rc, stderr = await ffmpeg_pool.run(["-i", "bad"])
+
+    assert rc == 1
+    assert "invalid input" in stderr
+
+
+@pytest.mark.asyncio
+async def test_run_keeps_only_stderr_tail():
+    lines = [f"frame={i}\n".encode() for i in range(ffmpeg_pool.STDERR_TAIL_LINES + 50)]
+    proc = _mock_proc(0, lines)
+    with patch(_SUBPROCESS_EXEC, return_value=proc):
+        _, stderr = await ffmpeg_pool.run(["-i", "in.m4a"])
+
+    kept = stderr.splitlines()
+    assert len(kept) == ffmpeg_pool.STDERR_TAIL_LINES
+    assert kept[-1] == f"frame={ffmpeg_pool.STDERR_TAIL_LINES + 49}"
+
+
+@pytest.mark.asyncio
+async def test_read_stderr_tail_splits_carriage_return_progress():
+    """Over 64 KiB of \r-terminated progress records do not overflow the reader."""
+    script = (
+        "import sys\n"
+        "for i in range(1000):\n"
+        "    sys.stderr.write(f'size={i:08d}kB time=00:00:00 ' + 'x' * 80 + '\\r')\n"
+        "sys.stderr.write('done\\n')\n"
+    )
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", script, stderr=asyncio.subprocess.PIPE
+    )
+    stderr = await ffmpeg_pool.read_stderr_tail(proc)
+
+    lines = stderr.splitlines()
+    assert proc.returncode == 0
+    assert len(lines) == ffmpeg_pool.STDERR_TAIL_LINES
+    assert lines[-1] == "done"
+
+
+@pytest.mark.asyncio
+async def test_read_stderr_tail_kills_process_on_error():
+    proc = _mock_proc()
+    proc.returncode = None
+    proc.kill = MagicMock()
+    proc.stderr.read.side_effect = OSError("read failed")
+
+    with pytest.raises(OSError):
+        await ffmpeg_pool.read_stderr_tail(proc)
+
+    proc.kill.assert_called_once()
+    proc.wait.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_probe_returns_code_and_stdout():
+    proc = AsyncMock()
+    proc.returncode = 0
+    proc.communicate.return_value = (b"flac,44100\n", None)
+    with patch(_SUBPROCESS_EXEC, return_value=proc) as mock_exec:
+        rc, stdout = await ffmpeg_pool.probe(["-of", "csv=p=0", "in.flac"])
+
+    assert rc == 0
+    assert stdout == "flac,44100\n"
+    assert mock_exec.call_args[0] == ("ffprobe", "-of", "csv=p=0", "in.flac")
+
+
+@pytest.mark.asyncio
+async def test_run_limits_concurrent_processes():
+    running = 0
+    peak = 0
+
+    async def fake_exec(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return _mock_proc()
+
+    with patch.object(ffmpeg_pool.config, "FFMPEG_CONCURRENCY", 2):
+        with patch.object(ffmpeg_pool, "_sems", weakref.WeakKeyDictionary()):
+            with patch(_SUBPROCESS_EXEC, side_effect=fake_exec):
+                await asyncio.gather(*(ffmpeg_pool.run(["-i", f"{i}.m4a"]) for i in range(6)))
+
+    assert peak <= 2
+
+
+def test_each_event_loop_gets_its_own_semaphore():
+    async def current_sem():
+        return ffmpeg_pool._get_sem()
+
+    first = asyncio.run(current_sem())
+    second = asyncio.run(current_sem())
+
+    assert first is not second
@@ -1,7 +1,9 @@
-"""Tests for the SSE job manager (subscribe, broadcast, cancel, history replay)."""
+"""Tests for the SSE job manager (broadcast, cursor reads, cancel, history replay)."""
 
 import asyncio
+
 import pytest
+
 from dropcrate.services.job_manager import JobManager
 
 
@@ -15,8 +17,8 @@ def test_create_job(manager):
     assert job.id
     assert len(job.id) == 8
     assert job.cancel_requested is False
-    assert job.history == []
-    assert job.subscribers == {}
+    assert list(job.history) == []
+    assert job.seq == 0
 
 
 def test_get_job(manager):
@@ -38,36 +40,34 @@ def test_broadcast_adds_to_history(manager):
 
 
 @pytest.mark.asyncio
-async def test_broadcast_delivers_to_subscriber(manager):
+async def test_broadcast_wakes_waiting_reader(manager):
     job = manager.create_job()
-    client_id, queue = manager.subscribe(job)
     event = {"type": "test", "data": "hello"}
+    waiter = asyncio.create_task(manager.wait_for_events(job, 0, timeout=1.0))
+    await asyncio.sleep(0)
     manager.broadcast(job, event)
-    received = await asyncio.wait_for(queue.get(), timeout=1.0)
-    assert received == event
+    events, cursor = await waiter
+    assert events == [event]
+    assert cursor == 1
 
 
 @pytest.mark.asyncio
-async def test_subscribe_replays_history(manager):
+async def test_cursor_zero_replays_history(manager):
     job = manager.create_job()
-    # Broadcast before subscribing
+    # Broadcast before the reader connects
     manager.broadcast(job, {"type": "event1"})
     manager.broadcast(job, {"type": "event2"})
 
-    client_id, queue = manager.subscribe(job)
-    # Should get history events
-    e1 = await asyncio.wait_for(queue.get(), timeout=1.0)
-    e2 = await asyncio.wait_for(queue.get(), timeout=1.0)
-    assert e1["type"] == "event1"
-    assert e2["type"] == "event2"
+    events, cursor = await manager.wait_for_events(job, 0, timeout=1.0)
+    assert [e["type"] for e in events] == ["event1", "event2"]
+    assert manager.events_since(job, cursor) == ([], cursor)
 
 
-def test_unsubscribe(manager):
+@pytest.mark.asyncio
+async def test_wait_for_events_times_out(manager):
     job = manager.create_job()
-    client_id, queue = manager.subscribe(job)
-    assert client_id in job.subscribers
-    manager.unsubscribe(job, client_id)
-    assert client_id not in job.subscribers
+    with pytest.raises(asyncio.TimeoutError):
+        await manager.wait_for_events(job, 0, timeout=0.01)
 
 
 def test_cancel_job(manager):
@@ -101,22 +101,26 @@ def test_history_capped_at_500(manager):
 
 
 @pytest.mark.asyncio
-async def test_multiple_subscribers(manager):
+async def test_multiple_readers(manager):
     job = manager.create_job()
-    _, q1 = manager.subscribe(job)
-    _, q2 = manager.subscribe(job)
+    w1 = asyncio.create_task(manager.wait_for_events(job, 0, timeout=1.0))
+    w2 = asyncio.create_task(manager.wait_for_events(job, 0, timeout=1.0))
+    await asyncio.sleep(0)
     manager.broadcast(job, {"type": "test"})
-    r1 = await asyncio.wait_for(q1.get(), timeout=1.0)
-    r2 = await asyncio.wait_for(q2.get(), timeout=1.0)
-    assert r1["type"] == "test"
-    assert r2["type"] == "test"
+    (r1, _), (r2, _) = await asyncio.gather(w1, w2)
+    assert r1[0]["type"] == "test"
+    assert r2[0]["type"] == "test"
 
 
-def test_unique_client_ids(manager):
+def test_lagging_reader_skips_overwritten_events(manager):
     job = manager.create_job()
-    c1, _ = manager.subscribe(job)
-    c2, _ = manager.subscribe(job)
-    assert c1 != c2
+    for i in range(600):
+        manager.broadcast(job, {"type": "event", "i": i})
+    events, cursor = manager.events_since(job, 50)
+    assert events[0]["i"] == 100
+    assert cursor == 600
+    events, _ = manager.events_since(job, 590)
+    assert [e["i"] for e in events] == list(range(590, 600))
 
 
 def test_unique_job_ids(manager):
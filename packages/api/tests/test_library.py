@@ -1,8 +1,10 @@
 """Tests for library API endpoints (list/download)."""
 
 import pytest
-from pathlib import Path
-from unittest.mock import patch
+
+
+def _by_id(resp):
+    return {t["id"]: t for t in resp.json()}
 
 
 @pytest.mark.asyncio
@@ -45,10 +47,10 @@ async def test_library_after_insert(client):
 
     resp = await client.get("/api/library")
     assert resp.status_code == 200
-    data = resp.json()
-    assert len(data) >= 1
+    tracks = _by_id(resp)
+    assert len(tracks) >= 1
 
-    track = next(t for t in data if t["id"] == "test-1")
+    track = tracks["test-1"]
     assert track["artist"] == "Test Artist"
     assert track["title"] == "Test Title"
     assert track["genre"] == "Afro House"
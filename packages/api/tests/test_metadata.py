@@ -1,7 +1,11 @@
 """Tests for the yt-dlp metadata fetch service (mocked)."""
 
+import asyncio
+import inspect
+import time
+from unittest.mock import MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
 
 @pytest.mark.asyncio
@@ -57,7 +61,6 @@ async def test_fetch_video_info_no_result_raises():
 @pytest.mark.asyncio
 async def test_fetch_video_info_has_timeout():
     """Test that fetch_video_info has a 60-second timeout."""
-    import asyncio
     from dropcrate.services.metadata import fetch_video_info
 
     async def slow_fetch(*args, **kwargs):
@@ -68,14 +71,12 @@ async def test_fetch_video_info_has_timeout():
     mock_ydl.__exit__ = MagicMock(return_value=False)
 
     def blocking_extract(*args, **kwargs):
-        import time
         time.sleep(100)
 
     mock_ydl.extract_info = blocking_extract
 
     # This should timeout but we'll test with a shorter duration for speed
     # Just verify the function signature includes timeout logic
-    import inspect
     source = inspect.getsource(fetch_video_info)
     assert "wait_for" in source or "timeout" in source
 
@@ -95,3 +96,22 @@ async def test_fetch_video_info_skip_download():
         _sync_fetch_info("https://www.youtube.com/watch?v=test")
         opts = mock_cls.call_args[0][0]
         assert opts.get("skip_download") is True
+
+
+@pytest.mark.asyncio
+async def test_fetch_video_info_cached():
+    """Repeated URLs (ignoring tracking params) should hit yt-dlp only once."""
+    from dropcrate.services import metadata
+
+    metadata._info_cache.clear()
+    with patch(
+        "dropcrate.services.metadata._sync_fetch_info", return_value={"id": "abc123"}
+    ) as mock_fetch:
+        first = await metadata.fetch_video_info("https://www.youtube.com/watch?v=abc123")
+        second = await metadata.fetch_video_info(
+            "https://www.youtube.com/watch?v=abc123&si=tracking"
+        )
+
+    assert first == second == {"id": "abc123"}
+    mock_fetch.assert_called_once()
+    metadata._info_cache.clear()
@@ -1,17 +1,18 @@
 """Tests for EBU R128 two-pass loudness normalization (mocked ffmpeg)."""
 
-import pytest
 from pathlib import Path
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from dropcrate.services.normalize import (
-    loudnorm_two_pass,
+    _build_pass2_args,
     _codec_for_format,
     _ext_for_format,
-    _extract_last_json,
+    _extract_last_json_str,
+    loudnorm_two_pass,
 )
 
-
 # --- Unit tests for helper functions ---
 
 def test_codec_for_aiff():
@@ -52,7 +53,7 @@ def test_ext_for_mp3():
 
 def test_extract_last_json_valid():
     text = 'lots of ffmpeg output\n{"input_i": "-20.5", "input_tp": "-3.2", "input_lra": "8.1", "input_thresh": "-31.0", "target_offset": "0.5"}\n'
-    result = _extract_last_json(text)
+    result = _extract_last_json_str(text)
     assert result["input_i"] == "-20.5"
     assert result["input_tp"] == "-3.2"
     assert result["input_lra"] == "8.1"
@@ -62,18 +63,34 @@ def test_extract_last_json_valid():
 
 def test_extract_last_json_multiple_objects():
     text = '{"first": true}\nmore output\n{"input_i": "-14.0", "input_tp": "-1.0", "input_lra": "11.0", "input_thresh": "-24.0", "target_offset": "0.0"}'
-    result = _extract_last_json(text)
+    result = _extract_last_json_str(text)
     assert result["input_i"] == "-14.0"
 
 
+def test_extract_last_json_multiline_block():
+    """ffmpeg prints the loudnorm summary as a multi-line block."""
+    text = "\n".join([
+        "[Parsed_loudnorm_0 @ 0x7f] ",
+        "{",
+        '\t"input_i" : "-20.50",',
+        '\t"input_tp" : "-3.20",',
+        '\t"target_offset" : "0.50"',
+        "}",
+        "size=N/A time=00:03:30.00",
+    ])
+    result = _extract_last_json_str(text)
+    assert result["input_i"] == "-20.50"
+    assert result["target_offset"] == "0.50"
+
+
 def test_extract_last_json_no_json_raises():
     with pytest.raises(RuntimeError, match="parse"):
-        _extract_last_json("no json here at all")
+        _extract_last_json_str("no json here at all")
 
 
 def test_extract_last_json_incomplete_raises():
     with pytest.raises(RuntimeError):
-        _extract_last_json('{ incomplete')
+        _extract_last_json_str('{ incomplete')
 
 
 # --- Integration tests with mocked ffmpeg ---
@@ -105,6 +122,28 @@ async def test_loudnorm_two_pass_calls_ffmpeg_twice():
     assert result == Path("/tmp/output.aiff")
 
 
+@pytest.mark.asyncio
+async def test_loudnorm_single_pass_calls_ffmpeg_once():
+    """single_pass=True should skip the analysis pass."""
+    calls = []
+
+    async def mock_run_ffmpeg(args):
+        calls.append(args)
+        return 0, ""
+
+    with patch("dropcrate.services.normalize._run_ffmpeg", side_effect=mock_run_ffmpeg):
+        result = await loudnorm_two_pass(
+            Path("/tmp/in.m4a"), Path("/tmp/out.aiff"), "aiff", single_pass=True
+        )
+
+    assert len(calls) == 1
+    assert result == Path("/tmp/out.aiff")
+    args = " ".join(calls[0])
+    assert "loudnorm=I=-14.0:TP=-1.0:LRA=11.0" in args
+    assert "measured_I" not in args
+    assert "pcm_s16be" in calls[0]
+
+
 @pytest.mark.asyncio
 async def test_loudnorm_pass1_uses_null_output():
     """Pass 1 should analyze only (output to null)."""
@@ -151,6 +190,46 @@ async def test_loudnorm_pass2_uses_measured_values():
     assert "linear=true" in pass2_args
 
 
+@pytest.mark.asyncio
+async def test_loudnorm_pass2_writes_final_codec_and_rate():
+    """Pass 2 encodes straight to the target format, so no transcode pass is needed."""
+    calls = []
+
+    async def mock_run_ffmpeg(args):
+        calls.append(args)
+        if len(calls) == 1:
+            return 0, (
+                '{"input_i": "-20", "input_tp": "-3", "input_lra": "8",'
+                ' "input_thresh": "-31", "target_offset": "0"}'
+            )
+        return 0, ""
+
+    with patch("dropcrate.services.normalize._run_ffmpeg", side_effect=mock_run_ffmpeg):
+        await loudnorm_two_pass(Path("/tmp/in.m4a"), Path("/tmp/out.mp3"), "mp3")
+
+    pass2_args = calls[1]
+    assert pass2_args[pass2_args.index("-acodec") + 1] == "libmp3lame"
+    assert pass2_args[pass2_args.index("-ar") + 1] == "44100"
+    assert pass2_args[-1] == str(Path("/tmp/out.mp3"))
+
+
+def test_build_pass2_args_filter():
+    measured = {
+        "input_i": "-20.5", "input_tp": "-3.2", "input_lra": "8.1",
+        "input_thresh": "-31.0", "target_offset": "0.5",
+        # Extra pass-1 keys are ignored
+        "output_i": "-14.0",
+    }
+    target = {"target_i": -14.0, "target_tp": -1.0, "target_lra": 11.0}
+    args = _build_pass2_args(Path("/tmp/in.m4a"), Path("/tmp/out.wav"), "wav", measured, target)
+
+    assert args[args.index("-af") + 1] == (
+        "loudnorm=I=-14.0:TP=-1.0:LRA=11.0:measured_I=-20.5:measured_TP=-3.2"
+        ":measured_LRA=8.1:measured_thresh=-31.0:offset=0.5:linear=true:print_format=summary"
+    )
+    assert args[args.index("-acodec") + 1] == "pcm_s16le"
+
+
 @pytest.mark.asyncio
 async def test_loudnorm_uses_correct_codec_per_format():
     """Different formats should use different codecs."""
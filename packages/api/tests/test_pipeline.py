@@ -1,16 +1,31 @@
 """Tests for the pipeline orchestrator (all external services mocked)."""
 
 import asyncio
+import contextlib
+import errno
 import json
-import pytest
 from pathlib import Path
-from unittest.mock import patch, AsyncMock, MagicMock, call
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
 
-from dropcrate.services.job_manager import JobManager, Job
+from dropcrate.models.internal import PipelineItem, PresetTags
 from dropcrate.models.schemas import (
-    QueueStartRequest, QueueItemInput, DJTags,
-    LoudnessConfig, AudioFormat, DownloadMode,
+    AudioFormat,
+    DJTags,
+    DownloadMode,
+    LoudnessConfig,
+    QueueItemInput,
+    QueueStartRequest,
 )
+from dropcrate.services import pipeline
+from dropcrate.services.job_manager import Job, JobManager
+
+# Validated once at import; models are read-only in the pipeline so sharing is safe
+_DEFAULT_DJTAGS = DJTags(genre="Other", energy="", time="", vibe="")
+_DEFAULT_LOUDNESS = LoudnessConfig(target_i=-14, target_tp=-1, target_lra=11)
+_MODE_CACHE = {m.value: m for m in DownloadMode}
+_FORMAT_CACHE = {f.value: f for f in AudioFormat}
 
 
 def make_request(items=None, mode="dj-safe", fmt="aiff", normalize=True, inbox="/tmp/test_inbox"):
@@ -18,14 +33,14 @@ def make_request(items=None, mode="dj-safe", fmt="aiff", normalize=True, inbox="
         items = [QueueItemInput(
             id="item-1",
             url="https://www.youtube.com/watch?v=abc123",
-            preset_snapshot=DJTags(genre="Other", energy="", time="", vibe=""),
+            preset_snapshot=_DEFAULT_DJTAGS,
         )]
     return QueueStartRequest(
         inbox_dir=inbox,
-        mode=DownloadMode(mode),
-        audio_format=AudioFormat(fmt),
+        mode=_MODE_CACHE[mode],
+        audio_format=_FORMAT_CACHE[fmt],
         normalize_enabled=normalize,
-        loudness=LoudnessConfig(target_i=-14, target_tp=-1, target_lra=11),
+        loudness=_DEFAULT_LOUDNESS,
         items=items,
     )
 
@@ -50,70 +65,80 @@ def manager():
 def _pipeline_patches(tmp_path):
     """Return a dict of all the patches needed to fully mock the pipeline."""
     return {
-        "fetch_video_info": patch("dropcrate.services.pipeline.fetch_video_info", new_callable=AsyncMock, return_value=FAKE_VIDEO_INFO),
-        "download_audio": patch("dropcrate.services.pipeline.download.download_audio", new_callable=AsyncMock, return_value=tmp_path / "test.m4a"),
-        "download_thumbnail": patch("dropcrate.services.pipeline.tagger.download_thumbnail", new_callable=AsyncMock, return_value=None),
-        "fingerprint": patch("dropcrate.services.pipeline.fingerprint.try_match_music_metadata", new_callable=AsyncMock, return_value=None),
-        "normalize": patch("dropcrate.services.pipeline.normalize.loudnorm_two_pass", new_callable=AsyncMock, return_value=tmp_path / "normalized.aiff"),
-        "transcode": patch("dropcrate.services.pipeline.transcode.transcode", new_callable=AsyncMock, return_value=tmp_path / "transcoded.aiff"),
-        "tag": patch("dropcrate.services.pipeline.tagger.apply_tags_and_artwork", new_callable=AsyncMock),
-        "shutil_move": patch("dropcrate.services.pipeline.shutil.move"),
-        "shutil_rmtree": patch("dropcrate.services.pipeline.shutil.rmtree"),
-        "get_db": patch("dropcrate.services.pipeline.get_db", new_callable=AsyncMock),
+        "fetch_video_info": patch.object(
+            pipeline, "fetch_video_info", new_callable=AsyncMock, return_value=FAKE_VIDEO_INFO
+        ),
+        "download_audio": patch.object(
+            pipeline.download,
+            "download_audio",
+            new_callable=AsyncMock,
+            return_value=tmp_path / "test.m4a",
+        ),
+        "download_thumbnail": patch.object(
+            pipeline.tagger, "download_thumbnail", new_callable=AsyncMock, return_value=None
+        ),
+        "fingerprint": patch.object(
+            pipeline.fingerprint,
+            "try_match_music_metadata",
+            new_callable=AsyncMock,
+            return_value=None,
+        ),
+        "normalize": patch.object(
+            pipeline.normalize,
+            "loudnorm_two_pass",
+            new_callable=AsyncMock,
+            return_value=tmp_path / "normalized.aiff",
+        ),
+        "transcode": patch.object(
+            pipeline.transcode,
+            "transcode",
+            new_callable=AsyncMock,
+            return_value=tmp_path / "transcoded.aiff",
+        ),
+        "tag": patch.object(pipeline.tagger, "apply_tags_and_artwork", new_callable=AsyncMock),
+        "fast_move": patch.object(pipeline, "_fast_move"),
+        "shutil_rmtree": patch.object(pipeline.shutil, "rmtree"),
+        "get_db": patch.object(pipeline, "get_db", new_callable=AsyncMock),
     }
 
 
+@pytest.fixture
+def pipeline_mocks(tmp_path):
+    """Enter all pipeline patches for the duration of a test."""
+    with contextlib.ExitStack() as stack:
+        mocks = {k: stack.enter_context(p) for k, p in _pipeline_patches(tmp_path).items()}
+        # Empty url_metadata / settings lookups
+        mocks["get_db"].return_value.execute_fetchall.return_value = []
+        yield mocks
+
+
 @pytest.mark.asyncio
-async def test_pipeline_broadcasts_queue_start_and_done(manager, tmp_path):
+async def test_pipeline_broadcasts_queue_start_and_done(manager, tmp_path, pipeline_mocks):
     """Pipeline should broadcast queue-start and queue-done events."""
     job = manager.create_job()
-    req = make_request(inbox=str(tmp_path))
-    events = []
-
-    original_broadcast = manager.broadcast
-    def capture(j, event):
-        events.append(event)
-        original_broadcast(j, event)
-
-    patches = _pipeline_patches(tmp_path)
-    with patch.object(manager, "broadcast", side_effect=capture):
-        with patch("dropcrate.services.pipeline.job_manager", manager):
-            mocks = {k: p.__enter__() for k, p in patches.items()}
-            try:
-                from dropcrate.services.pipeline import run_pipeline
-                await run_pipeline(job, req)
-            finally:
-                for p in patches.values():
-                    p.__exit__(None, None, None)
+    url = "https://www.youtube.com/watch?v=abc123"
+    items = [QueueItemInput(id=f"item-{i}", url=url) for i in range(1, 3)]
+    req = make_request(items=items, inbox=str(tmp_path))
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+    events = list(job.history)
 
     event_types = [e["type"] for e in events]
     assert "queue-start" in event_types
     assert "queue-done" in event_types
     assert "item-start" in event_types
+    # A repeated URL is fetched once and shared via the metadata cache
+    pipeline_mocks["fetch_video_info"].assert_called_once_with(url)
 
 
 @pytest.mark.asyncio
-async def test_pipeline_broadcasts_all_stages(manager, tmp_path):
+async def test_pipeline_broadcasts_all_stages(manager, tmp_path, pipeline_mocks):
     """Pipeline should broadcast progress for all processing stages."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path))
-    events = []
-
-    original_broadcast = manager.broadcast
-    def capture(j, event):
-        events.append(event)
-        original_broadcast(j, event)
-
-    patches = _pipeline_patches(tmp_path)
-    with patch.object(manager, "broadcast", side_effect=capture):
-        with patch("dropcrate.services.pipeline.job_manager", manager):
-            mocks = {k: p.__enter__() for k, p in patches.items()}
-            try:
-                from dropcrate.services.pipeline import run_pipeline
-                await run_pipeline(job, req)
-            finally:
-                for p in patches.values():
-                    p.__exit__(None, None, None)
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+    events = list(job.history)
 
     stages = [e.get("stage") for e in events if e.get("type") == "item-progress"]
     assert "metadata" in stages
@@ -125,23 +150,44 @@ async def test_pipeline_broadcasts_all_stages(manager, tmp_path):
     assert "finalize" in stages
 
 
+@pytest.mark.asyncio
+async def test_pipeline_processes_items_concurrently(manager, tmp_path, pipeline_mocks):
+    """Multi-item queues should start later items before the first one finishes."""
+    job = manager.create_job()
+    items = [
+        QueueItemInput(id=f"item-{i}", url=f"https://www.youtube.com/watch?v=abc12{i}")
+        for i in range(1, 4)
+    ]
+    req = make_request(items=items, inbox=str(tmp_path))
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+    events = list(job.history)
+
+    def index_of(event_type, item_id):
+        return next(
+            i for i, e in enumerate(events)
+            if e["type"] == event_type and e.get("item_id") == item_id
+        )
+
+    first_done = index_of("item-done", "item-1")
+    assert index_of("item-start", "item-2") < first_done
+    assert index_of("item-start", "item-3") < first_done
+
+
 @pytest.mark.asyncio
 async def test_pipeline_handles_error(manager, tmp_path):
     """If a stage fails, pipeline should broadcast item-error."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path))
-    events = []
-
-    original_broadcast = manager.broadcast
-    def capture(j, event):
-        events.append(event)
-        original_broadcast(j, event)
-
-    with patch.object(manager, "broadcast", side_effect=capture):
-        with patch("dropcrate.services.pipeline.job_manager", manager):
-            with patch("dropcrate.services.pipeline.fetch_video_info", new_callable=AsyncMock, side_effect=RuntimeError("Network error")):
-                from dropcrate.services.pipeline import run_pipeline
-                await run_pipeline(job, req)
+    with patch.object(pipeline, "job_manager", manager):
+        with patch.object(
+            pipeline,
+            "fetch_video_info",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("Network error"),
+        ):
+            await pipeline.run_pipeline(job, req)
+    events = list(job.history)
 
     event_types = [e["type"] for e in events]
     assert "item-error" in event_types
@@ -155,17 +201,9 @@ async def test_pipeline_cancel(manager, tmp_path):
     job = manager.create_job()
     job.cancel_requested = True
     req = make_request(inbox=str(tmp_path))
-    events = []
-
-    original_broadcast = manager.broadcast
-    def capture(j, event):
-        events.append(event)
-        original_broadcast(j, event)
-
-    with patch.object(manager, "broadcast", side_effect=capture):
-        with patch("dropcrate.services.pipeline.job_manager", manager):
-            from dropcrate.services.pipeline import run_pipeline
-            await run_pipeline(job, req)
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+    events = list(job.history)
 
     event_types = [e["type"] for e in events]
     assert "queue-done" in event_types
@@ -175,27 +213,13 @@ async def test_pipeline_cancel(manager, tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_pipeline_fast_mode_skips_normalize(manager, tmp_path):
+async def test_pipeline_fast_mode_skips_normalize(manager, tmp_path, pipeline_mocks):
     """In fast mode, pipeline should transcode instead of normalize."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path), mode="fast", normalize=False)
-    events = []
-
-    original_broadcast = manager.broadcast
-    def capture(j, event):
-        events.append(event)
-        original_broadcast(j, event)
-
-    patches = _pipeline_patches(tmp_path)
-    with patch.object(manager, "broadcast", side_effect=capture):
-        with patch("dropcrate.services.pipeline.job_manager", manager):
-            mocks = {k: p.__enter__() for k, p in patches.items()}
-            try:
-                from dropcrate.services.pipeline import run_pipeline
-                await run_pipeline(job, req)
-            finally:
-                for p in patches.values():
-                    p.__exit__(None, None, None)
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+    events = list(job.history)
 
     stages = [e.get("stage") for e in events if e.get("type") == "item-progress"]
     assert "transcode" in stages
@@ -203,42 +227,102 @@ async def test_pipeline_fast_mode_skips_normalize(manager, tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_pipeline_calls_normalize_in_dj_safe(manager, tmp_path):
+async def test_pipeline_transcodes_while_tagging(manager, tmp_path, pipeline_mocks):
+    """Without normalization, encoding and tagging share one ffmpeg run."""
+    job = manager.create_job()
+    req = make_request(inbox=str(tmp_path), mode="fast", fmt="aiff", normalize=False)
+
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["transcode"].assert_not_called()
+    kwargs = pipeline_mocks["tag"].call_args.kwargs
+    assert kwargs["media_path"] == tmp_path / "test.m4a"
+    assert kwargs["audio_codec"] == "pcm_s16be"
+    assert kwargs["output_path"].suffix == ".aiff"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_calls_normalize_in_dj_safe(manager, tmp_path, pipeline_mocks):
     """In dj-safe mode, pipeline should call loudnorm_two_pass."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path), mode="dj-safe", normalize=True)
 
-    patches = _pipeline_patches(tmp_path)
-    with patch("dropcrate.services.pipeline.job_manager", manager):
-        mocks = {k: p.__enter__() for k, p in patches.items()}
-        try:
-            from dropcrate.services.pipeline import run_pipeline
-            await run_pipeline(job, req)
-        finally:
-            for p in patches.values():
-                p.__exit__(None, None, None)
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["normalize"].assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_dj_safe_fuses_transcode(manager, tmp_path, pipeline_mocks):
+    """Loudnorm pass 2 writes the target codec/rate, so no separate transcode runs."""
+    job = manager.create_job()
+    req = make_request(inbox=str(tmp_path), mode="dj-safe", normalize=True)
+
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["normalize"].assert_called_once()
+    assert pipeline_mocks["normalize"].call_args.kwargs["audio_format"] == "aiff"
+    assert pipeline_mocks["transcode"].call_count == 0
+    # The tagger reads the normalized file directly as its only input
+    staged = pipeline_mocks["tag"].call_args.kwargs["media_path"]
+    assert staged == pipeline_mocks["normalize"].call_args.kwargs["output_path"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fast_mode_normalizes_single_pass(manager, tmp_path, pipeline_mocks):
+    """In fast mode with normalization enabled, loudnorm runs a single pass."""
+    job = manager.create_job()
+    req = make_request(inbox=str(tmp_path), mode="fast", normalize=True)
+
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["normalize"].assert_called_once()
+    assert pipeline_mocks["normalize"].call_args.kwargs["single_pass"] is True
+    pipeline_mocks["transcode"].assert_not_called()
+
 
-    mocks["normalize"].assert_called_once()
+@pytest.mark.asyncio
+async def test_pipeline_downloads_thumbnail_alongside_audio(manager, tmp_path, pipeline_mocks):
+    """The thumbnail fetch starts before the audio download finishes."""
+    thumb_started = asyncio.Event()
+
+    async def fake_thumbnail(url, dest):
+        thumb_started.set()
+        return dest
+
+    async def fake_download(url, work_dir):
+        await asyncio.wait_for(thumb_started.wait(), timeout=1)
+        return tmp_path / "test.m4a"
+
+    pipeline_mocks["download_thumbnail"].side_effect = fake_thumbnail
+    pipeline_mocks["download_audio"].side_effect = fake_download
+    job = manager.create_job()
+    req = make_request(inbox=str(tmp_path))
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["download_thumbnail"].assert_called_once()
+    assert pipeline_mocks["tag"].call_args.kwargs["artwork_path"].name == "cover.jpg"
 
 
 @pytest.mark.asyncio
-async def test_pipeline_calls_tagger(manager, tmp_path):
+async def test_pipeline_calls_tagger(manager, tmp_path, pipeline_mocks):
     """Pipeline should call apply_tags_and_artwork."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path))
 
-    patches = _pipeline_patches(tmp_path)
-    with patch("dropcrate.services.pipeline.job_manager", manager):
-        mocks = {k: p.__enter__() for k, p in patches.items()}
-        try:
-            from dropcrate.services.pipeline import run_pipeline
-            await run_pipeline(job, req)
-        finally:
-            for p in patches.values():
-                p.__exit__(None, None, None)
-
-    mocks["tag"].assert_called_once()
-    call_kwargs = mocks["tag"].call_args
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    pipeline_mocks["tag"].assert_called_once()
+    # Tagger writes the final file directly; nothing is moved into the inbox
+    assert pipeline_mocks["tag"].call_args.kwargs["output_path"].parent == tmp_path
+    pipeline_mocks["fast_move"].assert_not_called()
+    call_kwargs = pipeline_mocks["tag"].call_args
     # Should have tags dict with artist, title, genre, comment
     tags = call_kwargs.kwargs.get("tags") or call_kwargs[1].get("tags") or call_kwargs[0][2]
     assert "artist" in tags
@@ -248,26 +332,144 @@ async def test_pipeline_calls_tagger(manager, tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_pipeline_inserts_into_db(manager, tmp_path):
+async def test_pipeline_inserts_into_db(manager, tmp_path, pipeline_mocks):
     """Pipeline should insert the processed track into the library database."""
     job = manager.create_job()
     req = make_request(inbox=str(tmp_path))
 
-    patches = _pipeline_patches(tmp_path)
-    with patch("dropcrate.services.pipeline.job_manager", manager):
-        mocks = {k: p.__enter__() for k, p in patches.items()}
-        try:
-            from dropcrate.services.pipeline import run_pipeline
-            await run_pipeline(job, req)
-        finally:
-            for p in patches.values():
-                p.__exit__(None, None, None)
-
-    mock_db = mocks["get_db"]
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    mock_db = pipeline_mocks["get_db"]
     mock_db.assert_called()
     mock_conn = mock_db.return_value
-    mock_conn.execute.assert_called()
-    # Verify the INSERT call was made
-    insert_calls = [c for c in mock_conn.execute.call_args_list if "INSERT" in str(c)]
-    assert len(insert_calls) >= 1
-    mock_conn.commit.assert_called()
+    # The row is saved with executemany before the item is reported done
+    mock_conn.executemany.assert_called_once()
+    sql, rows = mock_conn.executemany.call_args[0]
+    assert "INSERT" in sql
+    assert len(rows) == 1
+    # One commit for the url_metadata cache entry, one for the library row
+    assert mock_conn.commit.call_count == 2
+    assert job.pending_rows == []
+    # Background finalize tasks are drained before queue-done
+    assert job.pending_tasks == []
+
+
+@pytest.mark.asyncio
+async def test_pipeline_saves_row_before_item_done(manager, tmp_path, pipeline_mocks):
+    """The library row is committed before item-done, not at the end of the job."""
+    job = manager.create_job()
+    req = make_request(inbox=str(tmp_path))
+    seen_at_insert = []
+
+    async def fake_executemany(sql, rows):
+        seen_at_insert.extend(e["type"] for e in job.history)
+
+    pipeline_mocks["get_db"].return_value.executemany.side_effect = fake_executemany
+    with patch.object(pipeline, "job_manager", manager):
+        await pipeline.run_pipeline(job, req)
+
+    assert "item-progress" in seen_at_insert
+    assert "item-done" not in seen_at_insert
+    assert "item-done" in [e["type"] for e in job.history]
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_uses_fresh_url_metadata_row(pipeline_mocks):
+    """A fresh url_metadata row skips the upstream yt-dlp fetch."""
+    pipeline_mocks["get_db"].return_value.execute_fetchall.return_value = [
+        {"json": json.dumps(FAKE_VIDEO_INFO)}
+    ]
+
+    info = await pipeline._cached_fetch("https://www.youtube.com/watch?v=abc123")
+
+    assert info == FAKE_VIDEO_INFO
+    pipeline_mocks["fetch_video_info"].assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_treats_read_error_as_miss(pipeline_mocks):
+    pipeline_mocks["get_db"].return_value.execute_fetchall.side_effect = RuntimeError("locked")
+
+    info = await pipeline._cached_fetch("https://www.youtube.com/watch?v=abc123")
+
+    assert info == FAKE_VIDEO_INFO
+    pipeline_mocks["fetch_video_info"].assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_keys_on_canonical_url(pipeline_mocks):
+    """Tracking params do not change the url_metadata key."""
+    conn = pipeline_mocks["get_db"].return_value
+    await pipeline._cached_fetch("https://www.youtube.com/watch?v=abc123")
+    await pipeline._cached_fetch("https://www.youtube.com/watch?v=abc123&si=share")
+
+    first, second = (c.args[1][0] for c in conn.execute_fetchall.call_args_list)
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_waiter_cancel_does_not_cancel_shared_lookup(pipeline_mocks):
+    release = asyncio.Event()
+
+    async def slow_fetch(url):
+        await release.wait()
+        return FAKE_VIDEO_INFO
+
+    pipeline_mocks["fetch_video_info"].side_effect = slow_fetch
+    url = "https://www.youtube.com/watch?v=abc123"
+    first = asyncio.create_task(pipeline._cached_fetch(url))
+    second = asyncio.create_task(pipeline._cached_fetch(url))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == FAKE_VIDEO_INFO
+    pipeline_mocks["fetch_video_info"].assert_called_once()
+
+
+def test_internal_struct_roundtrip():
+    """Queue inputs convert to frozen pipeline records with the same fields."""
+    src = QueueItemInput(
+        id="item-1",
+        url="https://www.youtube.com/watch?v=abc123",
+        preset_snapshot=DJTags(genre="Techno", energy="3/5", time="Peak", vibe="Dark"),
+    )
+    item = PipelineItem.from_input(src)
+
+    assert item == PipelineItem(
+        id="item-1",
+        url="https://www.youtube.com/watch?v=abc123",
+        preset_snapshot=PresetTags(genre="Techno", energy="3/5", time="Peak", vibe="Dark"),
+    )
+    assert PipelineItem.from_input(QueueItemInput(id="x", url="u")).preset_snapshot == PresetTags()
+    with pytest.raises(AttributeError):
+        item.url = "other"
+
+
+def test_fast_move_renames_within_filesystem(tmp_path):
+    src = tmp_path / "src.aiff"
+    src.write_bytes(b"audio")
+    dst = tmp_path / "dst.aiff"
+    pipeline._fast_move(src, dst)
+    assert dst.read_bytes() == b"audio"
+    assert not src.exists()
+
+
+def test_fast_move_falls_back_to_copy(tmp_path):
+    """A cross-device rename (EXDEV) falls back to copy then unlink."""
+    src = tmp_path / "src.aiff"
+    src.write_bytes(b"audio")
+    dst = tmp_path / "dst.aiff"
+    cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+    with patch.object(pipeline.os, "replace", side_effect=cross_device):
+        pipeline._fast_move(src, dst)
+    assert dst.read_bytes() == b"audio"
+    assert not src.exists()
+
+
+def test_fast_move_raises_other_errors(tmp_path):
+    src = tmp_path / "missing.aiff"
+    with pytest.raises(FileNotFoundError):
+        pipeline._fast_move(src, tmp_path / "dst.aiff")
+    assert not (tmp_path / "dst.aiff").exists()
@@ -1,7 +1,8 @@
 """Tests for queue API endpoints (start/stop)."""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from unittest.mock import patch, AsyncMock
 
 
 @pytest.mark.asyncio
@@ -126,3 +127,14 @@ async def test_queue_stop_null_job_id(client):
 async def test_queue_events_invalid_job(client):
     resp = await client.get("/api/queue/events?job_id=nonexistent")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_queue_start_malformed_json_rejected(client):
+    """Bodies are decoded with orjson; decode errors still surface as 422."""
+    resp = await client.post(
+        "/api/queue/start",
+        content=b'{"inbox_dir": "/data/inbox", "items": [',
+        headers={"content-type": "application/json"},
+    )
+    assert resp.status_code == 422
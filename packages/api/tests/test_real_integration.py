@@ -8,34 +8,77 @@ Run these on a machine with:
 
 Usage:
     cd packages/api
-    python -m pytest tests/test_real_integration.py -v -s --timeout=120
+    python -m pytest tests/test_real_integration.py -v --timeout=120
+
+Show the per-step details the tests log with:
+    python -m pytest tests/test_real_integration.py -v --log-cli-level=INFO
+
+Run tests in parallel (pytest-xdist; the audio download is shared across workers,
+and tests are deliberately not grouped so --dist load spreads them over all cores):
+    python -m pytest tests/test_real_integration.py -v -n auto --timeout=120
+
+Include slow variants (e.g. two-pass loudnorm) with:
+    python -m pytest tests/test_real_integration.py -v --run-slow
+
+Set DROPCRATE_SKIP_PROBE=1 to skip the YouTube reachability probe at collection,
+and DROPCRATE_ENABLE_CACHE=1 to reuse fetched video info across runs for a day.
 
 Skip with:
-    python -m pytest tests/test_real_integration.py -v -s -k "not real"
+    python -m pytest tests/test_real_integration.py -v -k "not real"
 """
 
-import json
-import subprocess
-import pytest
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import shutil
+import socket
+import time
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
+from dropcrate.services.classify_heuristic import heuristic_classify
+from dropcrate.services.download import download_audio, download_audio_with_info
+from dropcrate.services.metadata import fetch_video_info
+from dropcrate.services.naming import make_rekordbox_filename
+from dropcrate.services.normalize import loudnorm_two_pass
+from dropcrate.services.pipeline import transcode_and_tag
+from dropcrate.services.tagger import (
+    _build_tags,
+    apply_tags_and_artwork,
+    download_thumbnail,
+    pick_best_thumbnail_url,
+)
+from dropcrate.services.title_parser import normalize_from_youtube_title
+from dropcrate.services.transcode import download_and_transcode, transcode
+
+log = logging.getLogger(__name__)
+
 
 # Skip all tests if no internet or ffmpeg
+@functools.lru_cache(maxsize=1)
 def _has_internet():
+    # CI runners that know YouTube is reachable can skip the probe entirely
+    if os.environ.get("DROPCRATE_SKIP_PROBE"):
+        return True
+    # One A-record lookup plus one TCP connect; no TLS or page fetch. IPv4 only,
+    # like the yt-dlp calls (--force-ipv4), so a dead IPv6 route can't stall
+    # create_connection walking through every resolved address.
     try:
-        import urllib.request
-        urllib.request.urlopen("https://www.youtube.com", timeout=5)
+        ip = socket.gethostbyname("www.youtube.com")
+        socket.create_connection((ip, 443), timeout=1).close()
         return True
-    except Exception:
+    except OSError:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def _has_ffmpeg():
-    try:
-        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-        return True
-    except Exception:
-        return False
+    # PATH lookup only; no need to spawn ffmpeg
+    return shutil.which("ffmpeg") is not None
 
 
 skip_no_internet = pytest.mark.skipif(not _has_internet(), reason="No internet access to YouTube")
@@ -47,16 +90,142 @@ TEST_URL = "https://www.youtube.com/watch?v=aqz-KE-bpKQ"  # Big Buck Bunny (shor
 TEST_URL_MUSIC = "https://www.youtube.com/watch?v=jNQXAC9IVRw"  # "Me at the zoo" — first YouTube video
 
 
+# How long video info persisted in .pytest_cache stays fresh across runs
+_PERSISTED_INFO_TTL = 24 * 3600
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def video_info_cache(request):
+    """Return ``get_info(url)``, which fetches each URL's video info once per session.
+
+    Both test URLs start fetching concurrently when the fixture is set up.
+    Fetches go through the production yt-dlp lookup, so tests classify the
+    same info (categories included) as the pipeline does. With
+    DROPCRATE_ENABLE_CACHE=1 the info is also kept in pytest's cache dir for
+    a day, so later runs skip the network lookup entirely.
+    """
+    store = request.config.cache if os.environ.get("DROPCRATE_ENABLE_CACHE") else None
+    # One task per URL: concurrent callers share the in-flight lookup, and
+    # different URLs are fetched in parallel rather than behind one lock.
+    # The tasks live on the session loop, so consumers run there too.
+    fetches: dict[str, asyncio.Task] = {}
+
+    async def fetch(url: str) -> dict:
+        key = f"dropcrate/video_info/{hashlib.sha1(url.encode()).hexdigest()}"
+        if store is not None:
+            hit = store.get(key, None)
+            if hit and time.time() - hit["ts"] < _PERSISTED_INFO_TTL:
+                return hit["info"]
+        info = await fetch_video_info(url)
+        if store is not None:
+            store.set(key, {"ts": time.time(), "info": info})
+        return info
+
+    async def get_info(url: str) -> dict:
+        if url not in fetches:
+            fetches[url] = asyncio.ensure_future(fetch(url))
+        try:
+            return await fetches[url]
+        except Exception:
+            # Let a later test retry instead of replaying the failure
+            fetches.pop(url, None)
+            raise
+
+    for url in (TEST_URL, TEST_URL_MUSIC):
+        fetches[url] = asyncio.ensure_future(fetch(url))
+    yield get_info
+    # Stop prefetches no test awaited, and collect their results or errors
+    for task in fetches.values():
+        task.cancel()
+    await asyncio.gather(*fetches.values(), return_exceptions=True)
+
+
+@pytest.fixture(scope="session")
+def work_dir(tmp_path_factory):
+    """One directory for the whole session so repeated ffmpeg reads hit a warm page cache."""
+    return tmp_path_factory.mktemp("dropcrate_real")
+
+
+@pytest.fixture
+def out_dir(work_dir, request):
+    """Per-test output directory under the shared work dir."""
+    path = work_dir / request.node.name
+    path.mkdir()
+    return path
+
+
+def _read_only(path: Path) -> Path:
+    path.chmod(0o444)
+    return path
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shared_audio(tmp_path_factory, work_dir):
+    """Download TEST_URL's audio once per session, or once per run under xdist.
+
+    Tests read the file in place rather than getting their own copy, so it is
+    made read-only to catch any test that would modify it.
+    """
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        return _read_only(await download_audio(TEST_URL, work_dir / "shared_dl"))
+
+    from filelock import FileLock
+
+    # xdist workers each get their own basetemp under a common parent
+    root = tmp_path_factory.getbasetemp().parent
+    marker = root / "shared_audio.path"
+    with FileLock(f"{marker}.lock"):
+        if marker.is_file():
+            return Path(marker.read_text())
+        audio_path = _read_only(await download_audio(TEST_URL, root / "shared_dl"))
+        marker.write_text(str(audio_path))
+    return audio_path
+
+
+# Classification is pure and every test feeds it the same cached video info, so
+# compute each result once (normalize_from_youtube_title memoizes itself)
+_classifications: dict[str, object] = {}
+
+
+def _classify(info: dict):
+    """Heuristic classification of ``info``, memoized by video id (dicts aren't hashable)."""
+    video_id = info["id"]
+    if video_id not in _classifications:
+        _classifications[video_id] = heuristic_classify("test-item", info)
+    return _classifications[video_id]
+
+
+def _check_nonempty(path: Path) -> int:
+    """Return the size of ``path`` with a single stat; a missing file raises FileNotFoundError."""
+    size = path.stat().st_size
+    assert size > 0, f"File is empty: {path}"
+    return size
+
+
+# Characters Rekordbox/filesystems reject in filenames, as a deletion table
+_FORBIDDEN_CHARS = str.maketrans("", "", '/\\:*?"<>|')
+
+# ID3 text frames written by the tagger, keyed by ffmpeg's tag names
+_ID3_FRAMES = {"TPE1": "artist", "TIT2": "title", "TCON": "genre"}
+
+
+def _read_tags(path: Path) -> dict[str, str]:
+    """Read embedded artist/title/genre with mutagen, without spawning ffprobe."""
+    # Outputs here are AIFF; opening it directly skips mutagen.File's format sniffing
+    from mutagen.aiff import AIFF
+
+    tags = AIFF(str(path)).tags or {}
+    return {name: str(tags[frame].text[0]) for frame, name in _ID3_FRAMES.items() if frame in tags}
+
+
 # ─── METADATA TESTS ──────────────────────────────────────────────────────────
 
 
 @skip_no_internet
-@pytest.mark.asyncio
-async def test_real_fetch_video_info():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_real_fetch_video_info(video_info_cache):
     """Fetch real metadata from YouTube and verify all expected fields."""
-    from dropcrate.services.metadata import fetch_video_info
-
-    info = await fetch_video_info(TEST_URL)
+    info = await video_info_cache(TEST_URL)
 
     # Must have these fields
     assert "id" in info, "Missing 'id' in video info"
@@ -72,77 +241,69 @@ async def test_real_fetch_video_info():
     # Should have thumbnails
     assert "thumbnails" in info or "thumbnail" in info, "Missing thumbnail info"
 
-    print(f"\n  Video ID: {info['id']}")
-    print(f"  Title: {info['title']}")
-    print(f"  Duration: {info['duration']}s")
-    print(f"  Uploader: {info.get('uploader', 'N/A')}")
-    print(f"  Categories: {info.get('categories', [])}")
-    print(f"  Tags: {info.get('tags', [])[:5]}")
+    log.info("Video ID: %s", info['id'])
+    log.info("Title: %s", info['title'])
+    log.info("Duration: %ss", info['duration'])
+    log.info("Uploader: %s", info.get('uploader', 'N/A'))
+    log.info("Categories: %s", info.get('categories', []))
+    log.info("Tags: %s", info.get('tags', [])[:5])
     thumbs = info.get("thumbnails", [])
-    print(f"  Thumbnails: {len(thumbs)} available")
+    log.info("Thumbnails: %s available", len(thumbs))
 
 
 @skip_no_internet
-@pytest.mark.asyncio
-async def test_real_fetch_music_video_info():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_real_fetch_music_video_info(video_info_cache):
     """Fetch metadata for a real video and verify uploader/category fields."""
-    from dropcrate.services.metadata import fetch_video_info
-
-    info = await fetch_video_info(TEST_URL_MUSIC)
+    info = await video_info_cache(TEST_URL_MUSIC)
 
     assert info["id"] == "jNQXAC9IVRw"
     assert len(info["title"]) > 0
     assert info["duration"] > 0
-    print(f"\n  Title: {info['title']}")
-    print(f"  Uploader: {info.get('uploader', 'N/A')}")
+    log.info("Title: %s", info['title'])
+    log.info("Uploader: %s", info.get('uploader', 'N/A'))
 
 
 # ─── TITLE PARSER TESTS (with real YouTube titles) ───────────────────────────
 
 
 @skip_no_internet
-@pytest.mark.asyncio
-async def test_real_title_parsing():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_real_title_parsing(video_info_cache):
     """Fetch real video info and run the title parser on actual YouTube titles."""
-    from dropcrate.services.metadata import fetch_video_info
-    from dropcrate.services.title_parser import normalize_from_youtube_title
-
-    info = await fetch_video_info(TEST_URL)
+    info = await video_info_cache(TEST_URL)
     result = normalize_from_youtube_title(info["title"], info.get("uploader"))
 
     assert result.artist, "Artist should not be empty"
     assert result.title, "Title should not be empty"
 
-    print(f"\n  Raw title: {info['title']}")
-    print(f"  Parsed artist: {result.artist}")
-    print(f"  Parsed title: {result.title}")
-    print(f"  Version: {result.version or ''}")
+    log.info("Raw title: %s", info['title'])
+    log.info("Parsed artist: %s", result.artist)
+    log.info("Parsed title: %s", result.title)
+    log.info("Version: %s", result.version or '')
 
 
 # ─── HEURISTIC CLASSIFICATION (with real data) ──────────────────────────────
 
 
 @skip_no_internet
-@pytest.mark.asyncio
-async def test_real_heuristic_classify():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_real_heuristic_classify(video_info_cache):
     """Fetch real video info and run heuristic classification."""
-    from dropcrate.services.metadata import fetch_video_info
-    from dropcrate.services.classify_heuristic import heuristic_classify
-
-    info = await fetch_video_info(TEST_URL)
-    result = heuristic_classify("test-item", info)
+    info = await video_info_cache(TEST_URL)
+    result = _classify(info)
 
     assert result.kind is not None, "kind should not be None"
     assert result.confidence is not None, "confidence should not be None"
     assert 0.0 <= result.confidence <= 1.0
 
-    print(f"\n  Kind: {result.kind}")
-    print(f"  Genre: {result.genre}")
-    print(f"  Energy: {result.energy or ''}")
-    print(f"  Time: {result.time or ''}")
-    print(f"  Vibe: {result.vibe or ''}")
-    print(f"  Confidence: {result.confidence}")
-    print(f"  Notes: {result.notes or ''}")
+    log.info("Kind: %s", result.kind)
+    log.info("Genre: %s", result.genre)
+    log.info("Energy: %s", result.energy or '')
+    log.info("Time: %s", result.time or '')
+    log.info("Vibe: %s", result.vibe or '')
+    log.info("Confidence: %s", result.confidence)
+    log.info("Notes: %s", result.notes or '')
 
 
 # ─── DOWNLOAD TESTS ─────────────────────────────────────────────────────────
@@ -150,19 +311,16 @@ async def test_real_heuristic_classify():
 
 @skip_no_internet
 @pytest.mark.asyncio
-async def test_real_download_audio(tmp_path):
+async def test_real_download_audio(shared_audio):
     """Actually download audio from YouTube and verify the file exists."""
-    from dropcrate.services.download import download_audio
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
+    audio_path = shared_audio
 
     assert audio_path is not None, "download_audio returned None"
-    assert audio_path.exists(), f"Downloaded file does not exist: {audio_path}"
-    assert audio_path.stat().st_size > 0, f"Downloaded file is empty: {audio_path}"
+    size = _check_nonempty(audio_path)
 
-    print(f"\n  Downloaded: {audio_path}")
-    print(f"  Size: {audio_path.stat().st_size / 1024:.1f} KB")
-    print(f"  Extension: {audio_path.suffix}")
+    log.info("Downloaded: %s", audio_path)
+    log.info("Size: %.1f KB", size / 1024)
+    log.info("Extension: %s", audio_path.suffix)
 
 
 # ─── NORMALIZE TESTS ────────────────────────────────────────────────────────
@@ -171,13 +329,12 @@ async def test_real_download_audio(tmp_path):
 @skip_no_internet
 @skip_no_ffmpeg
 @pytest.mark.asyncio
-async def test_real_normalize_audio(tmp_path):
-    """Download audio, then run real EBU R128 normalization with ffmpeg."""
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.normalize import loudnorm_two_pass
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
-    output_path = tmp_path / "normalized.aiff"
+@pytest.mark.parametrize("passes", [1, pytest.param(2, marks=pytest.mark.slow)])
+async def test_real_normalize_audio(out_dir, shared_audio, passes):
+    """Run real EBU R128 normalization with ffmpeg (two-pass only with --run-slow)."""
+    # Inputs are only read, so every test uses the shared download directly
+    audio_path = shared_audio
+    output_path = out_dir / "normalized.aiff"
 
     normalized = await loudnorm_two_pass(
         input_path=audio_path,
@@ -186,14 +343,14 @@ async def test_real_normalize_audio(tmp_path):
         target_i=-14.0,
         target_tp=-1.0,
         target_lra=11.0,
+        single_pass=passes == 1,
     )
 
-    assert normalized.exists(), f"Normalized file does not exist: {normalized}"
-    assert normalized.stat().st_size > 0, "Normalized file is empty"
+    size = _check_nonempty(normalized)
     assert normalized.suffix in (".aiff", ".wav", ".flac", ".mp3")
 
-    print(f"\n  Input: {audio_path} ({audio_path.stat().st_size / 1024:.1f} KB)")
-    print(f"  Output: {normalized} ({normalized.stat().st_size / 1024:.1f} KB)")
+    log.info("Input: %s", audio_path)
+    log.info("Output: %s (%.1f KB)", normalized, size / 1024)
 
 
 # ─── TRANSCODE TESTS ────────────────────────────────────────────────────────
@@ -202,70 +359,30 @@ async def test_real_normalize_audio(tmp_path):
 @skip_no_internet
 @skip_no_ffmpeg
 @pytest.mark.asyncio
-async def test_real_transcode_to_aiff(tmp_path):
-    """Download audio and transcode to AIFF format."""
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.transcode import transcode
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
-    output_path = tmp_path / "output.aiff"
-
-    transcoded = await transcode(
-        input_path=audio_path,
-        output_path=output_path,
-        audio_format="aiff",
+async def test_real_transcode_all(out_dir, shared_audio):
+    """Transcode the shared download to every output format concurrently."""
+    formats = ("aiff", "mp3", "flac")
+    # Independent ffmpeg processes, so they can run on separate cores
+    results = await asyncio.gather(
+        *(transcode(shared_audio, out_dir / f"output.{fmt}", fmt) for fmt in formats)
     )
 
-    assert transcoded.exists(), f"Transcoded file does not exist: {transcoded}"
-    assert transcoded.stat().st_size > 0
-    assert transcoded.suffix == ".aiff"
-
-    print(f"\n  Input: {audio_path.suffix} ({audio_path.stat().st_size / 1024:.1f} KB)")
-    print(f"  Output: {transcoded.suffix} ({transcoded.stat().st_size / 1024:.1f} KB)")
+    log.info("Input: %s", shared_audio.suffix)
+    for fmt, transcoded in zip(formats, results):
+        size = _check_nonempty(transcoded)
+        assert transcoded.suffix == f".{fmt}"
+        log.info("Output: %s (%.1f KB)", transcoded.suffix, size / 1024)
 
 
 @skip_no_internet
 @skip_no_ffmpeg
 @pytest.mark.asyncio
-async def test_real_transcode_to_mp3(tmp_path):
-    """Download audio and transcode to MP3 format."""
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.transcode import transcode
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
-    output_path = tmp_path / "output.mp3"
-
-    transcoded = await transcode(
-        input_path=audio_path,
-        output_path=output_path,
-        audio_format="mp3",
-    )
-
-    assert transcoded.exists()
-    assert transcoded.suffix == ".mp3"
-    print(f"\n  Output: {transcoded} ({transcoded.stat().st_size / 1024:.1f} KB)")
-
-
-@skip_no_internet
-@skip_no_ffmpeg
-@pytest.mark.asyncio
-async def test_real_transcode_to_flac(tmp_path):
-    """Download audio and transcode to FLAC format."""
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.transcode import transcode
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
-    output_path = tmp_path / "output.flac"
-
-    transcoded = await transcode(
-        input_path=audio_path,
-        output_path=output_path,
-        audio_format="flac",
-    )
+async def test_real_download_and_transcode_stream(out_dir):
+    """Pipe yt-dlp straight into ffmpeg and verify the AIFF output."""
+    transcoded = await download_and_transcode(TEST_URL, out_dir / "streamed.aiff", "aiff")
 
-    assert transcoded.exists()
-    assert transcoded.suffix == ".flac"
-    print(f"\n  Output: {transcoded} ({transcoded.stat().st_size / 1024:.1f} KB)")
+    size = _check_nonempty(transcoded)
+    log.info("Output: %s (%.1f KB)", transcoded, size / 1024)
 
 
 # ─── TAGGER TESTS ───────────────────────────────────────────────────────────
@@ -274,14 +391,10 @@ async def test_real_transcode_to_flac(tmp_path):
 @skip_no_internet
 @skip_no_ffmpeg
 @pytest.mark.asyncio
-async def test_real_tag_and_verify(tmp_path):
+async def test_real_tag_and_verify(out_dir, shared_audio):
     """Download, transcode, tag, then verify tags are embedded in the file."""
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.transcode import transcode
-    from dropcrate.services.tagger import apply_tags_and_artwork, _build_tags
-
-    audio_path = await download_audio(TEST_URL, tmp_path)
-    output_path = tmp_path / "tagged.aiff"
+    audio_path = shared_audio
+    output_path = out_dir / "tagged.aiff"
     transcoded = await transcode(audio_path, output_path, "aiff")
 
     tags = _build_tags(
@@ -300,20 +413,12 @@ async def test_real_tag_and_verify(tmp_path):
         tags=tags,
     )
 
-    # Verify tags were written by reading them back with ffprobe
-    result = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", str(transcoded)],
-        capture_output=True,
-        text=True,
-    )
-    probe_data = json.loads(result.stdout)
-    file_tags = probe_data.get("format", {}).get("tags", {})
+    # Verify tags were written by reading them back in-process
+    lower_tags = _read_tags(transcoded)
 
-    print(f"\n  Tagged file: {transcoded}")
-    print(f"  File tags: {json.dumps(file_tags, indent=2)}")
+    log.info("Tagged file: %s", transcoded)
+    log.info("File tags: %s", lower_tags)
 
-    # ffmpeg tag keys are case-insensitive, normalize to lowercase
-    lower_tags = {k.lower(): v for k, v in file_tags.items()}
     assert lower_tags.get("artist") == "Test Artist", \
         f"Artist tag mismatch: {lower_tags.get('artist')}"
     assert lower_tags.get("title") == "Test Title", \
@@ -325,14 +430,10 @@ async def test_real_tag_and_verify(tmp_path):
 
 
 @skip_no_internet
-@pytest.mark.asyncio
-async def test_real_filename_generation():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_real_filename_generation(video_info_cache):
     """Fetch real video info, parse title, and generate Rekordbox-safe filename."""
-    from dropcrate.services.metadata import fetch_video_info
-    from dropcrate.services.title_parser import normalize_from_youtube_title
-    from dropcrate.services.naming import make_rekordbox_filename
-
-    info = await fetch_video_info(TEST_URL)
+    info = await video_info_cache(TEST_URL)
     parsed = normalize_from_youtube_title(info["title"], info.get("uploader"))
 
     filename = make_rekordbox_filename(
@@ -344,11 +445,11 @@ async def test_real_filename_generation():
     assert len(filename) > 0
     assert filename.endswith(".aiff")
     # No prohibited characters
-    for ch in ['/', '\\', ':', '*', '?', '"', '<', '>', '|']:
-        assert ch not in filename, f"Prohibited character '{ch}' in filename: {filename}"
+    assert filename.translate(_FORBIDDEN_CHARS) == filename, \
+        f"Prohibited character in filename: {filename}"
 
-    print(f"\n  Raw title: {info['title']}")
-    print(f"  Generated filename: {filename}")
+    log.info("Raw title: %s", info['title'])
+    log.info("Generated filename: %s", filename)
 
 
 # ─── FULL PIPELINE INTEGRATION TEST ─────────────────────────────────────────
@@ -357,69 +458,45 @@ async def test_real_filename_generation():
 @skip_no_internet
 @skip_no_ffmpeg
 @pytest.mark.asyncio
-async def test_real_full_pipeline_flow(tmp_path):
+async def test_real_full_pipeline_flow(out_dir):
     """
-    End-to-end test: fetch metadata -> parse title -> classify -> download
-    -> transcode -> tag -> verify output file.
+    End-to-end test: download audio + metadata (one yt-dlp run) -> parse title
+    -> classify -> transcode+tag (one ffmpeg run) -> verify output file.
 
     This is the complete pipeline that a user would trigger.
     """
-    import shutil
-    from dropcrate.services.metadata import fetch_video_info
-    from dropcrate.services.title_parser import normalize_from_youtube_title
-    from dropcrate.services.classify_heuristic import heuristic_classify
-    from dropcrate.services.download import download_audio
-    from dropcrate.services.transcode import transcode
-    from dropcrate.services.tagger import (
-        apply_tags_and_artwork,
-        _build_tags,
-        pick_best_thumbnail_url,
-        download_thumbnail,
-    )
-    from dropcrate.services.naming import make_rekordbox_filename
-
-    print("\n  === FULL PIPELINE TEST ===")
+    log.info("=== FULL PIPELINE TEST ===")
 
-    # Stage 1: Metadata
-    print("  [1/7] Fetching metadata...")
-    info = await fetch_video_info(TEST_URL)
+    # Stage 1: Download audio together with its metadata
+    log.info("[1/5] Downloading audio and metadata...")
+    audio_path, info = await download_audio_with_info(TEST_URL, out_dir / "dl")
     assert info["id"], "No video ID"
-    print(f"        Title: {info['title']}")
+    log.info("Title: %s", info['title'])
+    log.info("File: %s", audio_path.name)
+
+    # The thumbnail only needs the info, so fetch it while the next stages run
+    thumb_url = pick_best_thumbnail_url(info)
+    thumb_task = (
+        asyncio.create_task(download_thumbnail(thumb_url, out_dir / "cover.jpg"))
+        if thumb_url else None
+    )
 
     # Stage 2: Parse title
-    print("  [2/7] Parsing title...")
+    log.info("[2/5] Parsing title...")
     parsed = normalize_from_youtube_title(info["title"], info.get("uploader"))
-    print(f"        Artist: {parsed.artist}")
-    print(f"        Title: {parsed.title}")
+    log.info("Artist: %s", parsed.artist)
+    log.info("Title: %s", parsed.title)
 
     # Stage 3: Classify
-    print("  [3/7] Classifying...")
-    classification = heuristic_classify("test-pipeline", info)
-    print(f"        Kind: {classification.kind}, Genre: {classification.genre}")
-
-    # Stage 4: Download
-    print("  [4/7] Downloading audio...")
-    url = info.get("webpage_url") or TEST_URL
-    audio_path = await download_audio(url, tmp_path)
-    assert audio_path.exists()
-    print(f"        File: {audio_path.name} ({audio_path.stat().st_size / 1024:.1f} KB)")
-
-    # Stage 4b: Download thumbnail
-    thumb_url = pick_best_thumbnail_url(info)
-    thumb_path = None
-    if thumb_url:
-        thumb_path = await download_thumbnail(thumb_url, tmp_path / "cover.jpg")
-        print(f"        Thumbnail: {'downloaded' if thumb_path else 'failed'}")
-
-    # Stage 5: Transcode
-    print("  [5/7] Transcoding to AIFF...")
-    output_path = tmp_path / "transcoded.aiff"
-    transcoded = await transcode(audio_path, output_path, "aiff")
-    assert transcoded.exists()
-    print(f"        File: {transcoded.name} ({transcoded.stat().st_size / 1024:.1f} KB)")
+    log.info("[3/5] Classifying...")
+    classification = _classify(info)
+    log.info("Kind: %s, Genre: %s", classification.kind, classification.genre)
 
-    # Stage 6: Tag
-    print("  [6/7] Applying tags...")
+    thumb_path = await thumb_task if thumb_task else None
+    log.info("Thumbnail: %s", 'downloaded' if thumb_path else 'failed')
+
+    # Stage 4: Build tags and final filename
+    log.info("[4/5] Building tags...")
     tags = _build_tags(
         artist=parsed.artist,
         title=parsed.title,
@@ -430,38 +507,24 @@ async def test_real_full_pipeline_flow(tmp_path):
         source_url=info.get("webpage_url", ""),
         source_id=info.get("id", ""),
     )
-    await apply_tags_and_artwork(
-        media_path=transcoded,
-        ext=".aiff",
-        tags=tags,
-        artwork_path=thumb_path,
-    )
-
-    # Stage 7: Generate final filename and move
-    print("  [7/7] Finalizing...")
     final_name = make_rekordbox_filename(parsed.artist, parsed.title, ".aiff")
-    final_path = tmp_path / "inbox" / final_name
+    final_path = out_dir / "inbox" / final_name
     final_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.move(str(transcoded), str(final_path))
 
-    assert final_path.exists(), f"Final file missing: {final_path}"
-    assert final_path.stat().st_size > 10_000, f"Final file too small: {final_path.stat().st_size}"
+    # Stage 5: Transcode + tag straight into the inbox
+    log.info("[5/5] Transcoding to AIFF and applying tags...")
+    await transcode_and_tag(audio_path, final_path, "aiff", tags, thumb_path)
 
-    # Verify tags with ffprobe
-    result = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", str(final_path)],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
-        probe = json.loads(result.stdout)
-        file_tags = probe.get("format", {}).get("tags", {})
-        lower_tags = {k.lower(): v for k, v in file_tags.items()}
-        print(f"        Embedded artist: {lower_tags.get('artist', 'N/A')}")
-        print(f"        Embedded title: {lower_tags.get('title', 'N/A')}")
-        print(f"        Embedded genre: {lower_tags.get('genre', 'N/A')}")
-
-    print(f"\n  === PIPELINE COMPLETE ===")
-    print(f"  Final file: {final_path}")
-    print(f"  Size: {final_path.stat().st_size / 1024:.1f} KB")
-    print(f"  Ready for Rekordbox import!")
+    final_size = _check_nonempty(final_path)
+    assert final_size > 10_000, f"Final file too small: {final_size}"
+
+    # Verify embedded tags
+    lower_tags = _read_tags(final_path)
+    log.info("Embedded artist: %s", lower_tags.get('artist', 'N/A'))
+    log.info("Embedded title: %s", lower_tags.get('title', 'N/A'))
+    log.info("Embedded genre: %s", lower_tags.get('genre', 'N/A'))
+
+    log.info("=== PIPELINE COMPLETE ===")
+    log.info("Final file: %s", final_path)
+    log.info("Size: %.1f KB", final_size / 1024)
+    log.info("Ready for Rekordbox import!")
@@ -72,13 +72,7 @@ async def test_update_settings_inbox_dir(client):
 @pytest.mark.asyncio
 async def test_update_settings_partial(client):
     """Partial updates should not overwrite other fields."""
-    # First set to known state
-    await client.put("/api/settings", json={
-        "mode": "dj-safe",
-        "audio_format": "aiff",
-        "normalize_enabled": True,
-    })
-    # Now update only mode
+    # Each test starts from a fresh database, so the other fields hold their defaults
     await client.put("/api/settings", json={"mode": "fast"})
 
     resp = await client.get("/api/settings")
@@ -98,3 +92,14 @@ async def test_update_settings_invalid_mode(client):
 async def test_update_settings_invalid_format(client):
     resp = await client.put("/api/settings", json={"audio_format": "ogg"})
     assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_settings_db_commits_without_fsync():
+    """Settings writes go through a WAL journal with synchronous=NORMAL."""
+    from dropcrate.database import get_db
+
+    db = await get_db()
+    assert (await db.execute_fetchall("PRAGMA journal_mode"))[0][0] == "wal"
+    # 1 == NORMAL
+    assert (await db.execute_fetchall("PRAGMA synchronous"))[0][0] == 1
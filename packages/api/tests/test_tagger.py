@@ -1,7 +1,11 @@
-"""Tests for tag building and thumbnail URL selection."""
+"""Tests for tag building, thumbnail URL selection and tagging ffmpeg args."""
 
-from dropcrate.services.tagger import _build_tags, pick_best_thumbnail_url
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
+import pytest
+
+from dropcrate.services.tagger import _build_tags, apply_tags_and_artwork, pick_best_thumbnail_url
 
 # --- _build_tags ---
 
@@ -23,64 +27,37 @@ def test_build_tags_comment_has_source():
     assert "YOUTUBE_ID: abc" in tags["comment"]
 
 
-def test_build_tags_comment_has_energy():
-    tags = _build_tags(artist="A", title="T", genre="House", energy="3/5")
-    assert "ENERGY: 3/5" in tags["comment"]
-
-
-def test_build_tags_comment_has_time():
-    tags = _build_tags(artist="A", title="T", genre="House", time_slot="Peak")
-    assert "TIME: Peak" in tags["comment"]
-
-
-def test_build_tags_comment_has_vibe():
-    tags = _build_tags(artist="A", title="T", genre="House", vibe="Dark, Driving")
-    assert "VIBE: Dark, Driving" in tags["comment"]
-
-
-def test_build_tags_comment_omits_empty_energy():
-    tags = _build_tags(artist="A", title="T", genre="House", energy="")
-    assert "ENERGY:" not in tags["comment"]
-
-
-def test_build_tags_comment_omits_empty_time():
-    tags = _build_tags(artist="A", title="T", genre="House", time_slot="")
-    assert "TIME:" not in tags["comment"]
-
-
-def test_build_tags_comment_omits_empty_vibe():
-    tags = _build_tags(artist="A", title="T", genre="House", vibe="")
-    assert "VIBE:" not in tags["comment"]
-
+@pytest.mark.parametrize("kwarg,value,needle", [
+    ("energy", "3/5", "ENERGY: 3/5"),
+    ("time_slot", "Peak", "TIME: Peak"),
+    ("vibe", "Dark, Driving", "VIBE: Dark, Driving"),
+])
+def test_build_tags_comment_field(kwarg, value, needle):
+    tags = _build_tags(artist="A", title="T", genre="House", **{kwarg: value})
+    assert needle in tags["comment"]
 
-def test_build_tags_with_album():
-    tags = _build_tags(artist="A", title="T", genre="House", album="Great Album")
-    assert tags["album"] == "Great Album"
 
+@pytest.mark.parametrize("kwarg,prefix", [
+    ("energy", "ENERGY:"),
+    ("time_slot", "TIME:"),
+    ("vibe", "VIBE:"),
+])
+def test_build_tags_comment_omits_empty_field(kwarg, prefix):
+    tags = _build_tags(artist="A", title="T", genre="House", **{kwarg: ""})
+    assert prefix not in tags["comment"]
 
-def test_build_tags_no_album_if_empty():
-    tags = _build_tags(artist="A", title="T", genre="House", album="")
-    assert "album" not in tags
 
+@pytest.mark.parametrize("kwarg,value,tag_key", [
+    ("album", "Great Album", "album"),
+    ("year", "2024", "date"),
+    ("label", "Defected Records", "publisher"),
+])
+def test_build_tags_optional_field(kwarg, value, tag_key):
+    tags = _build_tags(artist="A", title="T", genre="House", **{kwarg: value})
+    assert tags[tag_key] == value
 
-def test_build_tags_with_year():
-    tags = _build_tags(artist="A", title="T", genre="House", year="2024")
-    assert tags["date"] == "2024"
-
-
-def test_build_tags_no_year_if_empty():
-    tags = _build_tags(artist="A", title="T", genre="House", year="")
-    assert "date" not in tags
-
-
-def test_build_tags_with_label():
-    tags = _build_tags(artist="A", title="T", genre="House", label="Defected Records")
-    assert tags["publisher"] == "Defected Records"
-
-
-def test_build_tags_no_label_if_empty():
-    tags = _build_tags(artist="A", title="T", genre="House", label="")
-    assert "publisher" not in tags
+    tags = _build_tags(artist="A", title="T", genre="House", **{kwarg: ""})
+    assert tag_key not in tags
 
 
 def test_build_tags_all_fields():
@@ -154,3 +131,44 @@ def test_thumbnail_skips_entries_without_url():
         ]
     }
     assert pick_best_thumbnail_url(info) == "https://img/valid.jpg"
+
+
+def test_thumbnail_tie_keeps_first():
+    info = {
+        "thumbnails": [
+            {"url": "https://img/first.webp", "width": 640, "height": 480},
+            {"url": "https://img/second.jpg", "width": 640, "height": 480},
+        ]
+    }
+    assert pick_best_thumbnail_url(info) == "https://img/first.webp"
+
+
+# --- apply_tags_and_artwork ---
+
+@pytest.mark.asyncio
+async def test_tagging_stream_copies_audio_by_default():
+    with patch("dropcrate.services.tagger._run_ffmpeg", new_callable=AsyncMock) as mock_run:
+        await apply_tags_and_artwork(
+            Path("/tmp/in.aiff"), ".aiff", {"artist": "A"}, output_path=Path("/tmp/out.aiff")
+        )
+
+    args = mock_run.call_args[0][0]
+    assert args[args.index("-c") + 1] == "copy"
+    assert "-write_id3v2" in args
+    assert args[-1] == str(Path("/tmp/out.aiff"))
+
+
+@pytest.mark.asyncio
+async def test_tagging_encodes_when_audio_codec_given():
+    with patch("dropcrate.services.tagger._run_ffmpeg", new_callable=AsyncMock) as mock_run:
+        await apply_tags_and_artwork(
+            Path("/tmp/in.m4a"), ".aiff", {"artist": "A"},
+            artwork_path=Path("/tmp/cover.jpg"),
+            output_path=Path("/tmp/out.aiff"),
+            audio_codec="pcm_s16be",
+        )
+
+    args = mock_run.call_args[0][0]
+    assert args[args.index("-c:a") + 1] == "pcm_s16be"
+    assert args[args.index("-ar") + 1] == "44100"
+    assert "attached_pic" in args
@@ -1,7 +1,6 @@
 """Comprehensive tests for YouTube title → artist/title/version normalization."""
 
-from dropcrate.services.title_parser import normalize_from_youtube_title
-
+from dropcrate.services.title_parser import has_artist_title_separator, normalize_from_youtube_title
 
 # --- Basic splitting ---
 
@@ -183,6 +182,13 @@ def test_correction_jcole():
     assert r.artist == "J. Cole"
 
 
+def test_corrections_apply_inside_multi_artist_names():
+    assert normalize_from_youtube_title("jay z & kanye west - Otis").artist == "JAY-Z & Kanye West"
+    r = normalize_from_youtube_title("drake x the weeknd - Crew Love")
+    assert r.artist == "Drake x The Weeknd"
+    assert normalize_from_youtube_title("a$ap rocky - Praise The Lord").artist == "A$AP Rocky"
+
+
 def test_uppercase_dj():
     r = normalize_from_youtube_title("dj mix - Track")
     assert r.artist == "DJ Mix"
@@ -232,3 +238,23 @@ def test_multiple_separators_first_wins():
     r = normalize_from_youtube_title("Artist - Title - Subtitle")
     assert r.artist == "Artist"
     assert "Title" in r.title
+
+
+# --- Memoization ---
+
+def test_repeated_title_returns_cached_result():
+    normalize_from_youtube_title.cache_clear()
+    first = normalize_from_youtube_title("Artist - Title (Extended Mix)", "Uploader")
+    second = normalize_from_youtube_title("Artist - Title (Extended Mix)", "Uploader")
+    assert second is first
+    assert normalize_from_youtube_title.cache_info().hits == 1
+
+
+# --- Separator detection ---
+
+def test_has_artist_title_separator():
+    assert has_artist_title_separator("Artist - Title")
+    assert has_artist_title_separator("Artist \u2014 Title")
+    assert has_artist_title_separator("Artist | Title")
+    assert not has_artist_title_separator("Jay-Z Title")
+
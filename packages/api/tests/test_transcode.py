@@ -1,10 +1,13 @@
 """Tests for audio format transcoding (mocked ffmpeg)."""
 
-import pytest
 from pathlib import Path
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
-from dropcrate.services.transcode import transcode, _codec_for_format
+from dropcrate.services.transcode import _codec_for_format, download_and_transcode, transcode
+
+_SUBPROCESS_EXEC = "dropcrate.services.ffmpeg_pool.asyncio.create_subprocess_exec"
 
 
 # --- Codec selection ---
@@ -36,9 +39,9 @@ async def test_transcode_calls_ffmpeg():
     """Test that transcode runs ffmpeg with correct args."""
     mock_proc = AsyncMock()
     mock_proc.returncode = 0
-    mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+    mock_proc.stderr.read.return_value = b""
 
-    with patch("dropcrate.services.transcode.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
+    with patch(_SUBPROCESS_EXEC, return_value=mock_proc) as mock_exec:
         result = await transcode(
             Path("/tmp/input.m4a"),
             Path("/tmp/output.aiff"),
@@ -60,9 +63,9 @@ async def test_transcode_raises_on_failure():
     """Test that transcode raises RuntimeError on ffmpeg failure."""
     mock_proc = AsyncMock()
     mock_proc.returncode = 1
-    mock_proc.communicate = AsyncMock(return_value=(b"", b"Error: invalid input"))
+    mock_proc.stderr.read.side_effect = [b"Error: invalid input\n", b""]
 
-    with patch("dropcrate.services.transcode.asyncio.create_subprocess_exec", return_value=mock_proc):
+    with patch(_SUBPROCESS_EXEC, return_value=mock_proc):
         with pytest.raises(RuntimeError, match="transcode failed"):
             await transcode(
                 Path("/tmp/input.m4a"),
@@ -75,9 +78,9 @@ async def test_transcode_raises_on_failure():
 async def test_transcode_mp3_uses_libmp3lame():
     mock_proc = AsyncMock()
     mock_proc.returncode = 0
-    mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+    mock_proc.stderr.read.return_value = b""
 
-    with patch("dropcrate.services.transcode.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
+    with patch(_SUBPROCESS_EXEC, return_value=mock_proc) as mock_exec:
         await transcode(Path("/tmp/in.m4a"), Path("/tmp/out.mp3"), "mp3")
 
     args = mock_exec.call_args[0]
@@ -88,9 +91,9 @@ async def test_transcode_mp3_uses_libmp3lame():
 async def test_transcode_flac():
     mock_proc = AsyncMock()
     mock_proc.returncode = 0
-    mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+    mock_proc.stderr.read.return_value = b""
 
-    with patch("dropcrate.services.transcode.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
+    with patch(_SUBPROCESS_EXEC, return_value=mock_proc) as mock_exec:
         await transcode(Path("/tmp/in.m4a"), Path("/tmp/out.flac"), "flac")
 
     args = mock_exec.call_args[0]
@@ -101,10 +104,82 @@ async def test_transcode_flac():
 async def test_transcode_uses_44100_sample_rate():
     mock_proc = AsyncMock()
     mock_proc.returncode = 0
-    mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+    mock_proc.stderr.read.return_value = b""
 
-    with patch("dropcrate.services.transcode.asyncio.create_subprocess_exec", return_value=mock_proc) as mock_exec:
+    with patch(_SUBPROCESS_EXEC, return_value=mock_proc) as mock_exec:
         await transcode(Path("/tmp/in.m4a"), Path("/tmp/out.wav"), "wav")
 
     args = mock_exec.call_args[0]
     assert "44100" in args
+
+
+@pytest.mark.asyncio
+async def test_transcode_stream_copies_matching_codec():
+    """An .aif input that is already pcm_s16be/44.1kHz is copied, not re-encoded."""
+    probe = AsyncMock()
+    probe.returncode = 0
+    probe.communicate.return_value = (b"pcm_s16be,44100\n", None)
+
+    with patch(_SUBPROCESS_EXEC, return_value=probe), \
+            patch("dropcrate.services.transcode.ffmpeg_pool.run",
+                  new_callable=AsyncMock, return_value=(0, "")) as mock_run:
+        await transcode(Path("/tmp/in.aif"), Path("/tmp/out.aiff"), "aiff")
+
+    args = mock_run.call_args[0][0]
+    assert args[args.index("-c:a") + 1] == "copy"
+    assert "pcm_s16be" not in args
+
+
+@pytest.mark.asyncio
+async def test_transcode_reencodes_other_sample_rate():
+    probe = AsyncMock()
+    probe.returncode = 0
+    probe.communicate.return_value = (b"pcm_s16be,48000\n", None)
+
+    with patch(_SUBPROCESS_EXEC, return_value=probe), \
+            patch("dropcrate.services.transcode.ffmpeg_pool.run",
+                  new_callable=AsyncMock, return_value=(0, "")) as mock_run:
+        await transcode(Path("/tmp/in.aif"), Path("/tmp/out.aiff"), "aiff")
+
+    args = mock_run.call_args[0][0]
+    assert "copy" not in args
+    assert "44100" in args
+
+
+# --- Streamed download + transcode ---
+
+@pytest.mark.asyncio
+async def test_download_and_transcode_pipes_into_ffmpeg():
+    """yt-dlp writes into a pipe that ffmpeg reads as pipe:0."""
+    downloader = MagicMock()
+    downloader.stderr.read = AsyncMock(return_value=b"")
+    downloader.wait = AsyncMock()
+    downloader.returncode = 0
+
+    with patch("dropcrate.services.transcode.download.download_audio_stream",
+               new_callable=AsyncMock, return_value=downloader) as mock_stream, \
+            patch("dropcrate.services.transcode.ffmpeg_pool.run",
+                  new_callable=AsyncMock, return_value=(0, "")) as mock_run:
+        result = await download_and_transcode("https://youtu.be/x", Path("/tmp/out.flac"), "flac")
+
+    assert result == Path("/tmp/out.flac")
+    args = mock_run.call_args[0][0]
+    assert args[args.index("-i") + 1] == "pipe:0"
+    assert "flac" in args
+    assert isinstance(mock_run.call_args.kwargs["stdin"], int)
+    assert isinstance(mock_stream.call_args.kwargs["stdout"], int)
+
+
+@pytest.mark.asyncio
+async def test_download_and_transcode_raises_on_download_failure():
+    downloader = MagicMock()
+    downloader.stderr.read = AsyncMock(side_effect=[b"ERROR: Video unavailable\n", b""])
+    downloader.wait = AsyncMock()
+    downloader.returncode = 1
+
+    with patch("dropcrate.services.transcode.download.download_audio_stream",
+               new_callable=AsyncMock, return_value=downloader), \
+            patch("dropcrate.services.transcode.ffmpeg_pool.run",
+                  new_callable=AsyncMock, return_value=(1, "pipe:0: Invalid data")):
+        with pytest.raises(RuntimeError, match="yt-dlp stream failed"):
+            await download_and_transcode("https://youtu.be/x", Path("/tmp/out.aiff"), "aiff")
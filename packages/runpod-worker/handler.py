@@ -2,42 +2,64 @@
 RunPod Serverless Handler for SAM-Audio inference.
 
 Deploy this to RunPod as a serverless GPU endpoint.
-It receives audio (base64) + prompt, runs SAM-Audio separation,
-and returns target + residual audio as base64.
+It receives audio (base64, or an ``audio_url`` to fetch) + prompt, runs
+SAM-Audio separation, and returns target + residual audio as base64.
 """
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
 import os
 import logging
+import urllib.request
+from collections import OrderedDict
 
 import runpod
-import soundfile as sf
 import torch
 import torchaudio
 
 logger = logging.getLogger(__name__)
 
 TARGET_SAMPLE_RATE = 48000
+# RunPod mounts an attached network volume here; weights cached on it survive cold starts
+NETWORK_VOLUME = "/runpod-volume"
 
 # Global model reference (loaded once, reused across requests)
 _model = None
 _device = None
+# Resample filters by source rate, built once on _device
+_resamplers: dict[int, torchaudio.transforms.Resample] = {}
+# bf16 autocast for the separation on GPUs that support it (Ampere and newer);
+# set SAM_AUDIO_AUTOCAST=0 to run in fp32
+_autocast = False
+# Preprocessed waveforms by BLAKE2 digest of the input bytes, most recent last.
+# Prompt/guidance sweeps resend the same clip; the cap bounds the VRAM held.
+_WAVEFORM_CACHE_SIZE = 8
+_waveforms: OrderedDict[bytes, torch.Tensor] = OrderedDict()
 
 
 def load_model():
     """Load SAM-Audio model (called once on cold start)."""
-    global _model, _device
+    global _model, _device, _autocast
     if _model is not None:
         return
 
+    # Must be set before huggingface_hub is first imported (by sam_audio)
+    if "HF_HOME" not in os.environ and os.path.isdir(NETWORK_VOLUME):
+        os.environ["HF_HOME"] = os.path.join(NETWORK_VOLUME, "hf-cache")
+
     from sam_audio import SAMAudio
 
     model_name = os.environ.get("SAM_AUDIO_MODEL", "facebook/sam-audio-base")
     hf_token = os.environ.get("HF_TOKEN") or None
 
     _device = "cuda" if torch.cuda.is_available() else "cpu"
+    _autocast = (
+        _device == "cuda"
+        and torch.cuda.is_bf16_supported()
+        and os.environ.get("SAM_AUDIO_AUTOCAST", "1") != "0"
+    )
     logger.info("Loading %s on %s ...", model_name, _device)
 
     _model = SAMAudio.from_pretrained(model_name, token=hf_token)
@@ -45,46 +67,77 @@ def load_model():
     logger.info("Model loaded")
 
 
+def fetch_audio(url: str) -> bytes:
+    """Download input audio from a (e.g. presigned) URL instead of inline base64."""
+    with urllib.request.urlopen(url, timeout=120) as resp:
+        return resp.read()
+
+
 def preprocess(audio_bytes: bytes) -> torch.Tensor:
-    """Load audio from bytes, resample to 48kHz mono."""
+    """Load audio from bytes, resample to 48kHz mono on ``_device``."""
     buf = io.BytesIO(audio_bytes)
     waveform, sr = torchaudio.load(buf)
 
     if waveform.shape[0] > 1:
         waveform = waveform.mean(dim=0, keepdim=True)
 
+    # Resample on the GPU; the filter kernel is reused for every request at this rate
+    waveform = waveform.to(_device)
     if sr != TARGET_SAMPLE_RATE:
-        waveform = torchaudio.transforms.Resample(sr, TARGET_SAMPLE_RATE)(waveform)
+        resampler = _resamplers.get(sr)
+        if resampler is None:
+            resampler = torchaudio.transforms.Resample(sr, TARGET_SAMPLE_RATE).to(_device)
+            _resamplers[sr] = resampler
+        waveform = resampler(waveform)
 
     return waveform
 
 
-def tensor_to_wav_b64(tensor: torch.Tensor) -> str:
-    """Convert audio tensor to base64-encoded WAV bytes."""
-    buf = io.BytesIO()
-    sf.write(buf, tensor.squeeze().numpy(), TARGET_SAMPLE_RATE, format="WAV")
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("ascii")
+def load_waveform(audio_bytes: bytes) -> torch.Tensor:
+    """``preprocess`` with an LRU cache keyed by the audio content."""
+    key = hashlib.blake2b(audio_bytes, digest_size=16).digest()
+    waveform = _waveforms.get(key)
+    if waveform is not None:
+        _waveforms.move_to_end(key)
+        return waveform
 
+    waveform = preprocess(audio_bytes)
+    _waveforms[key] = waveform
+    if len(_waveforms) > _WAVEFORM_CACHE_SIZE:
+        _waveforms.popitem(last=False)
+    return waveform
 
-def handler(job):
-    """RunPod handler function. Receives job input, returns output."""
-    load_model()
 
-    inp = job["input"]
-    audio_b64 = inp["audio_b64"]
-    prompt = inp["prompt"]
-    guidance_scale = inp.get("guidance_scale", 3.0)
-    num_steps = inp.get("num_steps", 16)
-    reranking_candidates = inp.get("reranking_candidates", 1)
+def to_pcm16(tensor: torch.Tensor) -> torch.Tensor:
+    """Quantize float audio to int16 on its device, then copy it to the CPU.
 
-    # Decode and preprocess audio
-    audio_bytes = base64.b64decode(audio_b64)
-    waveform = preprocess(audio_bytes)
-    audio = waveform.to(_device)
+    Converting before the copy moves half the bytes off the GPU and leaves
+    the WAV writer nothing to convert.
+    """
+    return (tensor.float().clamp(-1.0, 1.0) * 32767).to(torch.int16).cpu()
 
-    # Run separation
-    with torch.no_grad():
+
+def tensor_to_wav_b64(tensor: torch.Tensor) -> str:
+    """Convert an int16 audio tensor to base64-encoded 16-bit PCM WAV bytes."""
+    buf = io.BytesIO()
+    # Writes the tensor as-is (no .numpy() copy)
+    torchaudio.save(
+        buf, tensor.reshape(1, -1), TARGET_SAMPLE_RATE,
+        format="wav", encoding="PCM_S", bits_per_sample=16,
+    )
+    # getbuffer() is a zero-copy view; read() would copy the whole WAV first
+    return base64.b64encode(buf.getbuffer()).decode("ascii")
+
+
+def separate_one(
+    audio: torch.Tensor,
+    prompt: str,
+    guidance_scale: float,
+    num_steps: int,
+    reranking_candidates: int,
+) -> dict:
+    """Run one separation on an already preprocessed, on-device waveform."""
+    with torch.no_grad(), torch.autocast(device_type="cuda", dtype=torch.bfloat16, enabled=_autocast):
         result = _model.separate(
             audio,
             text_prompt=prompt,
@@ -98,8 +151,8 @@ def handler(job):
     else:
         target, residual = result["target"], result["residual"]
 
-    target = target.cpu()
-    residual = residual.cpu()
+    target = to_pcm16(target)
+    residual = to_pcm16(residual)
 
     duration = target.shape[-1] / TARGET_SAMPLE_RATE
 
@@ -110,4 +163,38 @@ def handler(job):
     }
 
 
+def handler(job):
+    """RunPod handler function. Receives job input, returns output.
+
+    Input carries either one ``prompt`` or a ``prompts`` list. A list runs
+    every prompt against a single upload, decode and resample of the audio
+    and returns ``{"results": [...]}`` in prompt order.
+    """
+    load_model()
+
+    inp = job["input"]
+    guidance_scale = inp.get("guidance_scale", 3.0)
+    num_steps = inp.get("num_steps", 16)
+    reranking_candidates = inp.get("reranking_candidates", 1)
+
+    # Fetch or decode, then preprocess audio
+    if "audio_url" in inp:
+        audio_bytes = fetch_audio(inp["audio_url"])
+    else:
+        audio_bytes = base64.b64decode(inp["audio_b64"])
+    audio = load_waveform(audio_bytes)
+
+    if "prompts" in inp:
+        return {
+            "results": [
+                separate_one(audio, prompt, guidance_scale, num_steps, reranking_candidates)
+                for prompt in inp["prompts"]
+            ]
+        }
+    return separate_one(audio, inp["prompt"], guidance_scale, num_steps, reranking_candidates)
+
+
+# Load the weights at worker boot, before RunPod hands this worker a job,
+# rather than inside the first request (handler's call is then a no-op)
+load_model()
 runpod.serverless.start({"handler": handler})